@@ -7,7 +7,7 @@ import threading
 from datetime import datetime, timedelta, time as dt_time, timezone
 import textwrap
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup, ForceReply
-from telegram.error import BadRequest
+from telegram.error import BadRequest, RetryAfter, TimedOut
 from telegram import ReactionTypeEmoji, Update
 from telegram.ext import (
     Application,
@@ -17,20 +17,27 @@ from telegram.ext import (
     ConversationHandler,
     filters,
     ContextTypes,
-    ApplicationHandlerStop
+    ApplicationHandlerStop,
+    BaseRateLimiter,
+    BaseUpdateProcessor
 )
-from pymongo import MongoClient
+from pymongo import MongoClient, ReturnDocument, UpdateOne
 from pymongo.errors import ConnectionFailure, ServerSelectionTimeoutError
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw, ImageFont, ImageOps
 import io
+import itertools
+import bisect
 import time
 from enum import Enum
+from dataclasses import dataclass
+from functools import cached_property, lru_cache, partial
 import re
 import pytesseract
 import finnhub
 from telegram.constants import ParseMode
+from telegram.request import HTTPXRequest
 import random
-from typing import List, Dict, Optional
+from typing import Any, List, Dict, Optional, NamedTuple, Tuple
 import tweepy
 
 logging.basicConfig(
@@ -43,6 +50,47 @@ FINNHUB_API_KEY = os.getenv('FINNHUB_API_KEY')
 if not FINNHUB_API_KEY:
     logger.warning("FINNHUB_API_KEY is not set. /news and /calendar commands will be disabled.")
 
+SUB_CACHE_TTL = 300
+OCR_CONCURRENCY = 2
+STATS_CACHE_TTL = 30
+PEAK_HOURS_CACHE_TTL = 3600
+PEAK_HOURS_WINDOW_DAYS = 30
+UTC_MIDNIGHT = dt_time(hour=0, minute=0, tzinfo=timezone.utc)
+UTC_2AM = dt_time(hour=2, minute=0, tzinfo=timezone.utc)
+UTC_10AM = dt_time(hour=10, minute=0, tzinfo=timezone.utc)
+UTC_NOON = dt_time(hour=12, minute=0, tzinfo=timezone.utc)
+UTC_6PM = dt_time(hour=18, minute=0, tzinfo=timezone.utc)
+UTC_END_OF_DAY = dt_time(hour=23, minute=55, tzinfo=timezone.utc)
+ADMIN_CACHE_TTL = 60
+ID_SET_CACHE_TTL = 60
+BROADCAST_CONCURRENCY = 25
+UPDATE_CONCURRENCY = 64
+REQUEST_POOL_SIZE = 256
+FAN_OUT_QUEUE_SIZE = 1000
+FAN_OUT_FETCH_BATCH = 500
+PUSH_CONNECTION_LIMIT = 20
+PUSH_TARGET_CHUNK = 1000
+BG_TASK_SHUTDOWN_TIMEOUT = 10
+SEPARATOR = '─' * 30
+BROADCAST_FOOTER = "\n\n🔕 Disable: /settings then toggle off Admin Signals & Announcements"
+TIPS_FOOTER = "\n\n🔕 Disable: /settings then toggle off Daily Tips"
+
+SIGNAL_PAIR_TOKENS = frozenset({
+    'EUR', 'USD', 'GBP', 'JPY', 'AUD', 'NZD', 'CAD', 'CHF',
+    'XAU', 'GOLD', 'SILVER', 'XAG', 'OIL', 'CRUDE',
+    'V25', 'V75', 'V100', 'BOOM', 'CRASH',
+    'US30', 'NAS100', 'SPX500'
+})
+SIGNAL_PAIR_TOKENS_RE = re.compile('|'.join(map(re.escape, sorted(SIGNAL_PAIR_TOKENS))))
+SIGNAL_PAIR_RE = re.compile(r'[A-Z]{3}[/\s]?[A-Z]{3}')
+SCHEDULE_OFFSET_RE = re.compile(r'(\d+)\s*([dhm])')
+BALANCE_RE = re.compile(r'\$?(\d[\d,]*\.\d{2})')
+SIGNAL_REQUIRED_FIELDS = ('pair', 'entry')
+SIGNAL_REQUIRED_RE = re.compile(
+    ''.join(f'(?=.*{re.escape(field)})' for field in SIGNAL_REQUIRED_FIELDS),
+    re.IGNORECASE | re.DOTALL
+)
+
 
 WAITING_INITIAL_PLATFORM, WAITING_MESSAGE, WAITING_BUTTONS, WAITING_PROTECTION, WAITING_TARGET = range(5)
 WAITING_TEMPLATE_NAME, WAITING_TEMPLATE_MESSAGE, WAITING_TEMPLATE_CATEGORY = range(5, 8)
@@ -118,6 +166,226 @@ ROLE_PERMISSIONS = {
     ]
 }
 
+ROLE_PERMISSION_SETS = {role: frozenset(perms) for role, perms in ROLE_PERMISSIONS.items()}
+
+ADMIN_COMMAND_CATEGORIES = {
+    'admin_broadcast': {
+        'title': "📢 Broadcasting Commands",
+        'description': "Manage sending messages and choosing optimal times.",
+        'cmds': [
+            "/broadcast - Start broadcasting",
+            "/schedule - Schedule a broadcast",
+            "/scheduled - View scheduled broadcasts",
+            "/bestschedule - View optimal broadcast times",
+        ]
+    },
+    'admin_approvals': {
+        'title': "✅ Approval System Commands",
+        'description': "Review and approve pending content.",
+        'cmds': [
+            "/approvals - View pending approvals",
+            "/signals - View signal suggestions",
+        ]
+    },
+    'admin_duties': {
+        'title': "📋 Team Duties & QA",
+        'description': "Manage daily admin tasks and monitor team performance.",
+        'cmds': [
+            "/myduty - View your assigned task",
+            "/dutycomplete - Mark your task as complete",
+            "/dutystats - View team completion stats (Super Admins only)",
+        ]
+    },
+    'admin_content': {
+        'title': "📚 Content & Education Management",
+        'description': "Manage the educational content database.",
+        'cmds': [
+            "/synceducation - Manually sync content from channel (Super Admin only)",
+            "/previeweducation - Preview a random piece of content",
+        ]
+    },
+    'admin_templates': {
+        'title': "📝 Template Management",
+        'description': "Create and manage message templates.",
+        'cmds': [
+            "/templates - Manage templates",
+            "/savetemplate - Save current as template",
+        ]
+    },
+    'admin_users': {
+        'title': "👥 User Management Commands",
+        'description': "Manage your bot's subscribers.",
+        'cmds': [
+            "/add &lt;user_id&gt; - Add subscriber",
+            "/stats - View statistics",
+            "/subscribers - List subscribers",
+        ]
+    },
+    'admin_admins': {
+        'title': "👨‍💼 Admin Management Commands",
+        'description': "Manage other administrators.",
+        'cmds': [
+            "/addadmin - Add new admin",
+            "/removeadmin - Remove admin",
+            "/admins - List all admins",
+        ]
+    },
+    'admin_monitoring': {
+        'title': "📊 Monitoring & Analytics",
+        'description': "Access logs and detailed performance metrics.",
+        'cmds': [
+            "/logs - View activity logs (Super Admin only)",
+            "/mystats - Your individual performance statistics",
+        ]
+    },
+    'admin_help': {
+        'title': "❓ Admin Help",
+        'description': "General information and assistance for admins.",
+        'cmds': [
+            "Need specific help? Contact Executives.",
+        ]
+    }
+}
+
+ADMIN_CATEGORY_HTML = {
+    key: (
+        f"<b>{info['title']}</b>\n\n"
+        f"{info['description']}\n\n"
+        f"<b>Commands:</b>\n"
+        + "\n".join(info['cmds'])
+    )
+    for key, info in ADMIN_COMMAND_CATEGORIES.items()
+}
+
+ADMIN_BACK_MARKUP = InlineKeyboardMarkup(
+    [[InlineKeyboardButton("⬅️ Back to Admin Main", callback_data='admin_main_menu')]]
+)
+
+WELCOME_NEW_TEMPLATE = (
+    "👋 <b>Welcome to PipSage, {name}!</b>\n\n"
+    
+    "📈 We're a community of <b>serious traders</b> who:\n"
+    "• Share high-quality signals\n"
+    "• Learn risk management together\n"
+    "• Use powerful trading tools\n\n"
+    
+    "🎯 <b>Get Started:</b>\n"
+    "/subscribe - Join VIP for premium signals\n"
+    "/positionsize - Calculate lot size for risk\n"
+    "/settings - Manage your notifications\n"
+    "/help - Show all commands\n\n"
+    
+    "💡 <b>Become a Contributor:</b>\n"
+    "Earn status by sharing quality signals with /suggestsignal\n\n"
+    
+    "<i>Enable notifications to never miss important updates!</i>"
+)
+
+WELCOME_BACK_TEMPLATE = (
+    "Welcome back, {name}! 👋\n\n"
+    
+    "Quick access:\n"
+    "/mystats - Your performance\n"
+    "/myprogress - Your signal progress\n" 
+    "/referral - Refer friends\n" 
+    "/subscribe - VIP access\n"
+    "/help - All commands"
+)
+
+HELP_TEXTS = {
+    'help_tools': (
+        "🛠 <b>Trading Tools</b>\n\n"
+        "/pips - Calculate pip profit/loss\n"
+        "/positionsize - Calculate lot size for risk\n"
+        "/news - Latest forex news\n"
+        "/calendar - Economic events\n\n"
+        "💡 All tools work instantly!"
+    ),
+    'help_vip': (
+        "💎 <b>VIP & Signals</b>\n\n"
+        "/subscribe - Join VIP for premium signals\n"
+        "/suggestsignal - Suggest a signal\n"
+        "/performance - View our public stats\n"
+        "/testimonials - See what members say\n\n"
+        "Join: /subscribe"
+    ),
+    'help_community': (
+        "🏆 <b>Community Features</b>\n\n"
+        "/referral - Refer friends, earn rewards\n"
+        "/mystats - View your signal stats\n"
+        "/myprogress - Track your signal progress\n"
+    ),
+    'help_account': (
+        "⚙️ <b>My Account</b>\n\n"
+        "/settings - Manage notifications\n"
+        "/start - View your main menu\n"
+    ),
+    'help_main': (
+        "❓ <b>PipSage Help</b>\n\n"
+        "What would you like to know about?"
+    )
+}
+
+HELP_MAIN_MARKUP = InlineKeyboardMarkup([
+    [InlineKeyboardButton("📊 Trading Tools", callback_data="help_tools")],
+    [InlineKeyboardButton("💎 VIP & Signals", callback_data="help_vip")],
+    [InlineKeyboardButton("🏆 Community", callback_data="help_community")],
+    [InlineKeyboardButton("⚙️ My Account", callback_data="help_account")]
+])
+
+HELP_BACK_MARKUP = InlineKeyboardMarkup(
+    [[InlineKeyboardButton("🔙 Back to Help", callback_data="help_main")]]
+)
+
+TEXT_NO_COMMAND = filters.TEXT & ~filters.COMMAND
+ALL_NO_COMMAND = filters.ALL & ~filters.COMMAND
+GREETING_TEXTS = frozenset({
+    "hello", "hi", "hey", "good morning", "good afternoon", "good evening",
+    "what's up", "howdy", "greetings", "hey there"
+})
+
+@dataclass(frozen=True, slots=True)
+class BroadcastPayload:
+    """Send-time view of a stored message_data dict, built once per broadcast"""
+    type: str
+    content: Optional[str] = None
+    file_id: Optional[str] = None
+    caption: Optional[str] = None
+    inline_buttons: Any = None
+    protect_content: bool = False
+
+    @classmethod
+    def from_message_data(cls, message_data: Dict) -> 'BroadcastPayload':
+        return cls(
+            type=message_data['type'],
+            content=message_data.get('content'),
+            file_id=message_data.get('file_id'),
+            caption=message_data.get('caption'),
+            inline_buttons=message_data.get('inline_buttons'),
+            protect_content=message_data.get('protect_content', False)
+        )
+
+    @property
+    def text(self) -> str:
+        """Message text for text payloads, caption for media"""
+        return (self.content if self.type == 'text' else self.caption) or ''
+
+class AdminContext(NamedTuple):
+    """Role and permission snapshot for one admin, resolved once per handler"""
+    role: AdminRole
+    permissions: frozenset
+    is_super: bool
+
+@lru_cache(maxsize=4096)
+def format_minute(ts_minute: int) -> str:
+    """Format a minute-resolution epoch (timestamp // 60) as 'YYYY-MM-DD HH:MM'"""
+    return datetime.fromtimestamp(ts_minute * 60).strftime('%Y-%m-%d %H:%M')
+
+@lru_cache(maxsize=8)
+def format_utc_day(ts_day: int) -> str:
+    """Format a day-resolution epoch (timestamp // 86400) as a UTC 'YYYY-MM-DD' key"""
+    return datetime.fromtimestamp(ts_day * 86400, timezone.utc).strftime('%Y-%m-%d')
+
 class PerformanceTransparency:
     """Show real, auditable performance"""
     
@@ -215,10 +483,28 @@ class AchievementSystem:
     async def check_and_award_achievements(user_id: int, context: ContextTypes.DEFAULT_TYPE, db):
         """Check if user earned new achievements"""
         
-        user = db.users_collection.find_one({'user_id': user_id})
+        user = db.users_collection.find_one({'user_id': user_id}, {'user_id': 1, 'achievements': 1})
         if not user:
             return []
-            
+        return await AchievementSystem._award_for_user(user, context, db)
+
+    @staticmethod
+    async def check_and_award_achievements_batch(user_ids, context: ContextTypes.DEFAULT_TYPE, db):
+        """Check several users, reading their achievement lists in one query"""
+        users = db.users_collection.find(
+            {'user_id': {'$in': list(user_ids)}},
+            {'user_id': 1, 'achievements': 1}
+        )
+        for user in users:
+            try:
+                await AchievementSystem._award_for_user(user, context, db)
+            except Exception as e:
+                logger.error(f"Error checking achievements for {user['user_id']}: {e}")
+
+    @staticmethod
+    async def _award_for_user(user: Dict, context: ContextTypes.DEFAULT_TYPE, db):
+        """Award any achievements the user now qualifies for"""
+        user_id = user['user_id']
         current_achievements = set(user.get('achievements', []))
         signal_stats = db.get_user_signal_stats(user_id)
         avg_rating = db.get_user_average_rating(user_id)
@@ -449,7 +735,6 @@ class PromotionManager:
                 )
                 
                 sent += 1
-                await asyncio.sleep(0.1)
             except:
                 pass
         
@@ -495,11 +780,11 @@ class BroadcastFrequencyManager:
 class BroadcastQualityChecker:
     """Ensure broadcast quality"""
     
+    SPAM_WORDS = ('100% guaranteed', 'act fast', 'limited time only')
+
     @staticmethod
     def check_broadcast_quality(message_data: dict) -> (bool, list):
         """Validate broadcast before sending"""
-        issues = []
-        
         content = ""
         if message_data['type'] == 'text':
             content = message_data['content']
@@ -509,43 +794,84 @@ class BroadcastQualityChecker:
         if not content:
              return True, [] 
 
+        issues = BroadcastQualityChecker._check_content(content)
+        return len(issues) == 0, list(issues)
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _check_content(content: str) -> tuple:
+        """Quality issues for a piece of text; memoized so re-submitted content is checked once"""
+        issues = []
+
         if len(content) < 10:
             issues.append("Message too short (minimum 10 characters)")
         
         if content.isupper() and len(content) > 50:
             issues.append("Avoid ALL CAPS messages")
         
-        emoji_count = 0
-        for char in content:
-            if char > '\u231a':
-                emoji_count += 1
+        emoji_count = sum(1 for char in content if char > '\u231a')
         
         if emoji_count > 15:
             issues.append("Too many emojis (max 15)")
         
-        spam_words = ['100% guaranteed', 'act fast', 'limited time only']
-        if any(word.lower() in content.lower() for word in spam_words):
+        lowered = content.lower()
+        if any(word in lowered for word in BroadcastQualityChecker.SPAM_WORDS):
             issues.append("Message contains spam-like phrases (e.g., '100% guaranteed')")
         
-        link_count = content.lower().count('http')
+        link_count = lowered.count('http')
         if link_count > 3:
             issues.append(f"Too many links ({link_count}). Max 3 per message.")
         
-        return len(issues) == 0, issues
+        return tuple(issues)
 
 class UserEngagementTracker:
     """Track user interaction to personalize experience"""
     
     def __init__(self, db):
         self.db = db
+        # user_id -> (last activity time, {action: increment})
+        self._pending: Dict[int, Tuple[float, Dict[str, int]]] = {}
+        self._lock = threading.Lock()
     
     def update_engagement(self, user_id: int, action: str, value: int = 1):
         """Track user activity"""
+        self.update_engagement_many(user_id, {action: value})
+
+    def queue_engagement(self, user_id: int, action: str, value: int = 1):
+        """Buffer a counter bump, merging repeats per user; never writes, flush_engagement_job does"""
+        with self._lock:
+            counters = self._pending.get(user_id, (0.0, {}))[1]
+            counters[action] = counters.get(action, 0) + value
+            self._pending[user_id] = (time.time(), counters)
+
+    def flush_engagement(self):
+        """Write all buffered counters with one bulk_write"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        try:
+            self.db.users_collection.bulk_write([
+                UpdateOne(
+                    {'user_id': user_id},
+                    {
+                        '$set': {'last_activity': last_activity},
+                        '$inc': {f'engagement.{action}': value for action, value in counters.items()}
+                    },
+                    upsert=True
+                )
+                for user_id, (last_activity, counters) in pending.items()
+            ], ordered=False)
+        except Exception as e:
+            logger.error(f"Error flushing engagement for {len(pending)} users: {e}")
+
+    def update_engagement_many(self, user_id: int, actions: Dict[str, int]):
+        """Track several activity counters in a single write"""
         self.db.users_collection.update_one(
             {'user_id': user_id},
             {
                 '$set': {'last_activity': time.time()},
-                '$inc': {f'engagement.{action}': value}
+                '$inc': {f'engagement.{action}': value for action, value in actions.items()}
             },
             upsert=True
         )
@@ -609,8 +935,6 @@ class UserEngagementTracker:
                     {'user_id': user['user_id']},
                     {'$set': {'re_engaged': True}}
                 )
-                
-                await asyncio.sleep(1) 
             except:
                 pass
 
@@ -628,6 +952,7 @@ class NotificationManager:
 
     def __init__(self, db):
         self.db = db
+        self._opt_out_cache: Dict[str, tuple] = {}
 
     def get_notification_preferences(self, user_id: int) -> dict:
         """Get user's notification settings, applying defaults"""
@@ -642,33 +967,39 @@ class NotificationManager:
         
         return prefs
 
+    def get_opted_out_users(self, notification_type: str) -> frozenset:
+        """
+        IDs of users who switched notification_type off, cached for ID_SET_CACHE_TTL seconds.
+        Opt-outs are a small minority, so this set stays far smaller than the user base.
+        """
+        cached = self._opt_out_cache.get(notification_type)
+        if cached and cached[0] > time.time():
+            return cached[1]
+        cursor = self.db.users_collection.find(
+            {f'notifications.{notification_type}': False},
+            {'_id': 0, 'user_id': 1}
+        )
+        opted_out = frozenset(user['user_id'] for user in cursor)
+        self._opt_out_cache[notification_type] = (time.time() + ID_SET_CACHE_TTL, opted_out)
+        return opted_out
+
+    def invalidate_opt_outs(self):
+        """Forget cached opt-out sets after a user changes their settings"""
+        self._opt_out_cache.clear()
+
     def get_eligible_users(self, user_ids: set, notification_type: str) -> set:
         """
-        Fetch users who have opted IN for a specific notification_type in ONE query.
-        Solves the N+1 query disaster.
+        Filter user_ids down to users who have not opted OUT of notification_type.
+        One small query for the opt-outs instead of shipping every ID to Mongo.
         """
         if not user_ids:
             return set()
-            
-        user_ids_list = list(user_ids)
-        eligible_users = set()
-        
-        CHUNK_SIZE = 10000
-        
-        for i in range(0, len(user_ids_list), CHUNK_SIZE):
-            chunk = user_ids_list[i:i + CHUNK_SIZE]
-            
-            query = {
-                'user_id': {'$in': chunk},
-                f'notifications.{notification_type}': {'$ne': False}
-            }
-            
-            cursor = self.db.users_collection.find(query, {'user_id': 1})
-            
-            for user in cursor:
-                eligible_users.add(user['user_id'])
-                
-        return eligible_users
+        return set(user_ids) - self.get_opted_out_users(notification_type)
+
+    def iter_eligible_users(self, notification_type: str):
+        """Stream IDs of all users opted IN for notification_type, batch by batch"""
+        opted_out = self.get_opted_out_users(notification_type)
+        return (user_id for user_id in self.db.iter_user_ids() if user_id not in opted_out)
 
     def should_notify(self, user_id: int, notification_type: str) -> bool:
         """Check if user wants this notification"""
@@ -676,13 +1007,42 @@ class NotificationManager:
             logger.warning(f"Invalid notification_type check: {notification_type}")
             return True 
 
-        prefs = self.get_notification_preferences(user_id)
-        return prefs.get(notification_type, True)
+        return user_id not in self.get_opted_out_users(notification_type)
 
  
 
 
         
+class ActivityBuffer:
+    """Thread-safe buffer of activity log entries written with one insert_many per flush"""
+
+    def __init__(self, collection, flush_at: int = 500):
+        self.collection = collection
+        self.flush_at = flush_at
+        self._entries: List[Dict] = []
+        self._lock = threading.Lock()
+
+    def append(self, entry: Dict):
+        with self._lock:
+            self._entries.append(entry)
+            if len(self._entries) < self.flush_at:
+                return
+            entries, self._entries = self._entries, []
+        self._write(entries)
+
+    def flush(self):
+        with self._lock:
+            entries, self._entries = self._entries, []
+        self._write(entries)
+
+    def _write(self, entries: List[Dict]):
+        if not entries:
+            return
+        try:
+            self.collection.insert_many(entries, ordered=False)
+        except Exception as e:
+            logger.error(f"Error flushing {len(entries)} activity log entries: {e}")
+
 class MongoDBHandler:
     """Handle all MongoDB operations"""
 
@@ -699,6 +1059,9 @@ class MongoDBHandler:
         self.broadcast_approvals_collection = None
         self.signal_suggestions_collection = None
         self.used_cr_numbers_collection = None  
+        self._stats_cache = None
+        self._peak_hours_cache = None
+        self._id_set_cache: Dict[str, tuple] = {}
         self.connect()
 
     def connect(self):
@@ -708,7 +1071,11 @@ class MongoDBHandler:
                 self.connection_string,
                 serverSelectionTimeoutMS=5000,
                 connectTimeoutMS=10000,
-                socketTimeoutMS=10000
+                socketTimeoutMS=10000,
+                maxPoolSize=200,
+                minPoolSize=10,
+                maxIdleTimeMS=300000,
+                retryWrites=True
             )
             self.client.admin.command('ping')
             self.db = self.client['telegram_bot']
@@ -718,17 +1085,19 @@ class MongoDBHandler:
             self.templates_collection = self.db['templates']
             self.scheduled_broadcasts_collection = self.db['scheduled_broadcasts']
             self.activity_logs_collection = self.db['activity_logs']
+            self.activity_buffer = ActivityBuffer(self.activity_logs_collection)
             self.broadcast_approvals_collection = self.db['broadcast_approvals']
             self.signal_suggestions_collection = self.db['signal_suggestions']
             self.used_cr_numbers_collection = self.db['used_cr_numbers'] 
             self.users_collection.create_index('user_id', unique=True)
+            self.users_collection.create_index('last_activity', sparse=True)
             self.subscribers_collection.create_index('user_id', unique=True)
             self.admins_collection.create_index('user_id', unique=True)
             self.templates_collection.create_index('created_by')
             self.scheduled_broadcasts_collection.create_index('scheduled_time')
             self.activity_logs_collection.create_index([('timestamp', -1)])
-            self.broadcast_approvals_collection.create_index('status')
-            self.signal_suggestions_collection.create_index('status')
+            self.broadcast_approvals_collection.create_index([('status', 1), ('created_at', 1)])
+            self.signal_suggestions_collection.create_index([('status', 1), ('created_at', 1)])
             self.used_cr_numbers_collection.create_index('cr_number', unique=True)
             self.vip_requests_collection = self.db['vip_requests']
             self.vip_requests_collection.create_index([('user_id', 1), ('status', 1)])
@@ -745,7 +1114,7 @@ class MongoDBHandler:
     def add_user(self, user_id: int, username: str = None, first_name: str = None):
         """Add or update a user"""
         try:
-            self.users_collection.update_one(
+            result = self.users_collection.update_one(
                 {'user_id': user_id},
                 {
                     '$set': {
@@ -764,11 +1133,45 @@ class MongoDBHandler:
                 },
                 upsert=True
             )
+            if result.upserted_id is not None:
+                self._invalidate_id_sets('users')
             return True
         except Exception as e:
             logger.error(f"Error adding user {user_id}: {e}")
             return False
 
+    def upsert_user(self, user_id: int, username: str = None, first_name: str = None,
+                    extra_fields: Dict = None) -> Optional[Dict]:
+        """Add or update a user, returning the document as it was before the update"""
+        try:
+            before = self.users_collection.find_one_and_update(
+                {'user_id': user_id},
+                {
+                    '$set': {
+                        'user_id': user_id,
+                        'username': username,
+                        'first_name': first_name,
+                        'last_activity': time.time(),
+                        **(extra_fields or {})
+                    },
+                    '$setOnInsert': {
+                        'created_at': time.time(),
+                        'achievements': [],
+                        'referrals': 0,
+                        'daily_tips_enabled': True,
+                        'leaderboard_public': True
+                    }
+                },
+                upsert=True,
+                return_document=ReturnDocument.BEFORE
+            )
+            if before is None:
+                self._invalidate_id_sets('users')
+            return before
+        except Exception as e:
+            logger.error(f"Error upserting user {user_id}: {e}")
+            return None
+
     def delete_user_fully(self, user_id: int):
         """Completely remove all traces of a user from the database"""
         try:
@@ -781,6 +1184,7 @@ class MongoDBHandler:
             self.signal_suggestions_collection.delete_many({'suggested_by': user_id})
             self.scheduled_broadcasts_collection.delete_many({'created_by': user_id})
             self.templates_collection.delete_many({'created_by': user_id})
+            self._invalidate_id_sets('users', 'subscribers', 'admins')
             
             logger.info(f"🗑️ Permanently deleted all data for user {user_id}")
             return True
@@ -801,6 +1205,7 @@ class MongoDBHandler:
                 },
                 upsert=True
             )
+            self._invalidate_id_sets('subscribers')
             return True
         except Exception as e:
             logger.error(f"Error subscribing user {user_id}: {e}")
@@ -812,6 +1217,7 @@ class MongoDBHandler:
             self.users_collection.delete_one({'user_id': user_id})
             self.subscribers_collection.delete_one({'user_id': user_id})
             self.notifications_collection.delete_many({'user_id': user_id})
+            self._invalidate_id_sets('users', 'subscribers')
             logger.info(f"🗑️ Automatically removed blocked user: {user_id}")
             return True
         except Exception as e:
@@ -833,6 +1239,7 @@ class MongoDBHandler:
         """Remove a subscriber"""
         try:
             result = self.subscribers_collection.delete_one({'user_id': user_id})
+            self._invalidate_id_sets('subscribers')
             return result.deleted_count > 0
         except Exception as e:
             logger.error(f"Error unsubscribing user {user_id}: {e}")
@@ -918,58 +1325,178 @@ class MongoDBHandler:
 
     
 
-    def get_all_users(self) -> set:
+    def _cached_id_set(self, name: str, collection) -> frozenset:
+        """Return the user_id set of a collection, cached for ID_SET_CACHE_TTL seconds"""
+        cached = self._id_set_cache.get(name)
+        if cached and cached[0] > time.time():
+            return cached[1]
+        ids = frozenset(doc['user_id'] for doc in collection.find({}, {'_id': 0, 'user_id': 1}))
+        self._id_set_cache[name] = (time.time() + ID_SET_CACHE_TTL, ids)
+        return ids
+
+    def _invalidate_id_sets(self, *names: str):
+        """Drop cached ID sets after membership changes"""
+        for name in names:
+            self._id_set_cache.pop(name, None)
+
+    def get_all_users(self) -> frozenset:
         """Get all user IDs"""
         try:
-            users = self.users_collection.find({}, {'user_id': 1})
-            return {user['user_id'] for user in users}
+            return self._cached_id_set('users', self.users_collection)
         except Exception as e:
             logger.error(f"Error getting all users: {e}")
-            return set()
+            return frozenset()
+
+    def iter_user_ids(self, query: Dict = None, batch_size: int = 1000):
+        """Yield user IDs matching query straight off the cursor without building a set"""
+        try:
+            cursor = self.users_collection.find(query or {}, {'_id': 0, 'user_id': 1}).batch_size(batch_size)
+            for user in cursor:
+                yield user['user_id']
+        except Exception as e:
+            logger.error(f"Error iterating user IDs: {e}")
+
+    def iter_user_ids_by_target(self, target: str, batch_size: int = 1000):
+        """
+        Yield the user IDs of a broadcast target from a server-side cursor.
+        Non-subscribers are resolved with a $lookup so no ID set is built in Python.
+        """
+        try:
+            if target == 'subscribers':
+                cursor = self.subscribers_collection.find({}, {'_id': 0, 'user_id': 1}).batch_size(batch_size)
+            elif target == 'admins':
+                cursor = self.admins_collection.find({}, {'_id': 0, 'user_id': 1}).batch_size(batch_size)
+            elif target == 'nonsubscribers':
+                cursor = self.users_collection.aggregate([
+                    {'$project': {'_id': 0, 'user_id': 1}},
+                    {'$lookup': {
+                        'from': self.subscribers_collection.name,
+                        'localField': 'user_id',
+                        'foreignField': 'user_id',
+                        'as': 'subscription'
+                    }},
+                    {'$match': {'subscription': {'$size': 0}}},
+                    {'$project': {'user_id': 1}}
+                ], batchSize=batch_size)
+            else:
+                cursor = self.users_collection.find({}, {'_id': 0, 'user_id': 1}).batch_size(batch_size)
+            for doc in cursor:
+                yield doc['user_id']
+        except Exception as e:
+            logger.error(f"Error iterating users for target {target}: {e}")
+
+    def count_target_users(self, target: str) -> int:
+        """Count a broadcast target's users with count_documents instead of loading their IDs"""
+        try:
+            if target == 'subscribers':
+                return self.subscribers_collection.count_documents({})
+            if target == 'admins':
+                return self.admins_collection.count_documents({})
+            if target == 'nonsubscribers':
+                return max(0, self.users_collection.count_documents({}) - self.subscribers_collection.count_documents({}))
+            return self.users_collection.count_documents({})
+        except Exception as e:
+            logger.error(f"Error counting users for target {target}: {e}")
+            return 0
 
-    def get_all_subscribers(self) -> set:
+    def get_all_subscribers(self) -> frozenset:
         """Get all subscriber IDs"""
         try:
-            subscribers = self.subscribers_collection.find({}, {'user_id': 1})
-            return {sub['user_id'] for sub in subscribers}
+            return self._cached_id_set('subscribers', self.subscribers_collection)
         except Exception as e:
             logger.error(f"Error getting all subscribers: {e}")
-            return set()
+            return frozenset()
 
-    def get_all_admin_ids(self) -> set:
+    def get_all_admin_ids(self) -> frozenset:
         """Get all admin user IDs"""
         try:
-            admins = self.admins_collection.find({}, {'user_id': 1})
-            return {admin['user_id'] for admin in admins}
+            return self._cached_id_set('admins', self.admins_collection)
         except Exception as e:
             logger.error(f"Error getting all admin IDs: {e}")
-            return set()
+            return frozenset()
 
     def get_stats(self) -> Dict:
-        """Get bot statistics"""
+        """Get bot statistics (cached for STATS_CACHE_TTL seconds)"""
+        if self._stats_cache and self._stats_cache[0] > time.time():
+            return self._stats_cache[1]
+
+        def count_stage(name: str, match: Dict = None) -> List[Dict]:
+            stages = [{'$match': match}] if match else []
+            return stages + [{'$group': {'_id': name, 'n': {'$sum': 1}}}]
+
         try:
-            total_users = self.users_collection.count_documents({})
-            total_subscribers = self.subscribers_collection.count_documents({})
-            total_admins = self.admins_collection.count_documents({})
-            total_templates = self.templates_collection.count_documents({})
-            total_scheduled = self.scheduled_broadcasts_collection.count_documents({'status': 'pending'})
-            pending_approvals = self.broadcast_approvals_collection.count_documents({'status': 'pending'})
-            pending_signals = self.signal_suggestions_collection.count_documents({'status': 'pending'})
+            pending = {'status': 'pending'}
+            pipeline = count_stage('total_users')
+            for coll, name, match in [
+                ('subscribers', 'subscribers', None),
+                ('admins', 'admins', None),
+                ('templates', 'templates', None),
+                ('scheduled_broadcasts', 'scheduled_broadcasts', pending),
+                ('broadcast_approvals', 'pending_approvals', pending),
+                ('signal_suggestions', 'pending_signals', pending),
+            ]:
+                pipeline.append({'$unionWith': {'coll': coll, 'pipeline': count_stage(name, match)}})
 
-            return {
+            counts = {doc['_id']: doc['n'] for doc in self.users_collection.aggregate(pipeline)}
+            total_users = counts.get('total_users', 0)
+            total_subscribers = counts.get('subscribers', 0)
+
+            stats = {
                 'total_users': total_users,
                 'subscribers': total_subscribers,
                 'non_subscribers': total_users - total_subscribers,
-                'admins': total_admins,
-                'templates': total_templates,
-                'scheduled_broadcasts': total_scheduled,
-                'pending_approvals': pending_approvals,
-                'pending_signals': pending_signals
+                'admins': counts.get('admins', 0),
+                'templates': counts.get('templates', 0),
+                'scheduled_broadcasts': counts.get('scheduled_broadcasts', 0),
+                'pending_approvals': counts.get('pending_approvals', 0),
+                'pending_signals': counts.get('pending_signals', 0)
             }
+            self._stats_cache = (time.time() + STATS_CACHE_TTL, stats)
+            return stats
         except Exception as e:
             logger.error(f"Error getting stats: {e}")
             return {}
 
+    def get_peak_activity_hours(self, limit: int = 3) -> List[Dict]:
+        """
+        Busiest UTC hours by last activity of users seen in the past PEAK_HOURS_WINDOW_DAYS
+        (cached for PEAK_HOURS_CACHE_TTL seconds). The range $match runs on the last_activity index.
+        """
+        if self._peak_hours_cache and self._peak_hours_cache[0] > time.time():
+            return self._peak_hours_cache[1]
+
+        cutoff = time.time() - timedelta(days=PEAK_HOURS_WINDOW_DAYS).total_seconds()
+        pipeline = [
+            {
+                '$match': {'last_activity': {'$gte': cutoff}}
+            },
+            {
+                '$project': {
+                    'hour': {
+                        '$hour': {
+                            '$toDate': {'$multiply': ['$last_activity', 1000]}
+                        }
+                    }
+                }
+            },
+            {
+                '$group': {
+                    '_id': '$hour',
+                    'count': {'$sum': 1}
+                }
+            },
+            {'$sort': {'count': -1}},
+            {'$limit': limit}
+        ]
+
+        try:
+            peak_hours = list(self.users_collection.aggregate(pipeline))
+            self._peak_hours_cache = (time.time() + PEAK_HOURS_CACHE_TTL, peak_hours)
+            return peak_hours
+        except Exception as e:
+            logger.error(f"Error getting peak activity hours: {e}")
+            return []
+
     def add_admin(self, user_id: int, role: AdminRole, added_by: int):
         """Add an admin with role"""
         try:
@@ -991,6 +1518,7 @@ class MongoDBHandler:
                 },
                 upsert=True
             )
+            self._invalidate_id_sets('admins')
             self.log_activity(added_by, 'add_admin', {'target_user': user_id, 'role': role.value})
             return True
         except Exception as e:
@@ -1001,6 +1529,7 @@ class MongoDBHandler:
         """Remove an admin"""
         try:
             result = self.admins_collection.delete_one({'user_id': user_id})
+            self._invalidate_id_sets('admins')
             if result.deleted_count > 0:
                 self.log_activity(removed_by, 'remove_admin', {'target_user': user_id})
                 return True
@@ -1012,7 +1541,7 @@ class MongoDBHandler:
     def get_admin_role(self, user_id: int) -> Optional[AdminRole]:
         """Get admin role"""
         try:
-            admin = self.admins_collection.find_one({'user_id': user_id})
+            admin = self.admins_collection.find_one({'user_id': user_id}, {'role': 1})
             if admin:
                 return AdminRole(admin['role'])
             return None
@@ -1020,6 +1549,17 @@ class MongoDBHandler:
             logger.error(f"Error getting admin role for {user_id}: {e}")
             return None
 
+    def get_admin_roles(self) -> Optional[Dict[int, AdminRole]]:
+        """Get a user_id -> role mapping for all admins"""
+        try:
+            return {
+                admin['user_id']: AdminRole(admin['role'])
+                for admin in self.admins_collection.find({}, {'user_id': 1, 'role': 1})
+            }
+        except Exception as e:
+            logger.error(f"Error loading admin roles: {e}")
+            return None
+
     def get_all_admins(self) -> List[Dict]:
         """Get all admins"""
         try:
@@ -1048,6 +1588,19 @@ class MongoDBHandler:
         except Exception as e:
             logger.error(f"Error logging activity: {e}")
 
+    def log_activity_buffered(self, user_id: int, action: str, details: Dict = None):
+        """Queue an activity entry; it is written on the next flush_activity() or when the buffer fills"""
+        self.activity_buffer.append({
+            'user_id': user_id,
+            'action': action,
+            'details': details or {},
+            'timestamp': time.time()
+        })
+
+    def flush_activity(self):
+        """Write any buffered activity entries"""
+        self.activity_buffer.flush()
+
     def get_activity_logs(self, limit: int = 50, user_id: int = None) -> List[Dict]:
         """Get activity logs"""
         try:
@@ -1193,10 +1746,13 @@ class MongoDBHandler:
             if rating is not None:
                 update_data['rating'] = rating
 
-            self.signal_suggestions_collection.update_one(
+            suggestion = self.signal_suggestions_collection.find_one_and_update(
                 {'_id': ObjectId(suggestion_id)},
-                {'$set': update_data}
+                {'$set': update_data},
+                projection={'suggested_by': 1}
             )
+            if rating is not None and suggestion and suggestion.get('suggested_by') is not None:
+                self.refresh_user_average_rating(suggestion['suggested_by'])
             log_details = {'suggestion_id': suggestion_id}
             if rating:
                 log_details['rating'] = rating
@@ -1206,6 +1762,32 @@ class MongoDBHandler:
             logger.error(f"Error updating suggestion status: {e}")
             return False
 
+    def approve_suggestion(self, suggestion_id: str, reviewed_by: int, rating: int) -> Optional[Dict]:
+        """
+        Atomically mark a suggestion approved and return the updated document.
+        Returns None if it does not exist or was already approved.
+        """
+        try:
+            from bson.objectid import ObjectId
+            suggestion = self.signal_suggestions_collection.find_one_and_update(
+                {'_id': ObjectId(suggestion_id), 'status': {'$ne': 'approved'}},
+                {'$set': {
+                    'status': 'approved',
+                    'reviewed_by': reviewed_by,
+                    'reviewed_at': time.time(),
+                    'rating': rating
+                }},
+                return_document=ReturnDocument.AFTER
+            )
+            if not suggestion:
+                return None
+            self.refresh_user_average_rating(suggestion['suggested_by'])
+            self.log_activity(reviewed_by, 'signal_approved', {'suggestion_id': suggestion_id, 'rating': rating})
+            return suggestion
+        except Exception as e:
+            logger.error(f"Error approving suggestion: {e}")
+            return None
+
     def save_template(self, name: str, message_data: Dict, category: str, created_by: int):
         """Save a message template"""
         try:
@@ -1314,6 +1896,26 @@ class MongoDBHandler:
         except Exception as e:
             logger.error(f"Error updating broadcast status: {e}")
 
+    def claim_scheduled_broadcasts(self, broadcast_ids: List) -> bool:
+        """Mark due broadcasts as sending before delivery so a crash mid-tick can't resend them"""
+        try:
+            self.scheduled_broadcasts_collection.update_many(
+                {'_id': {'$in': broadcast_ids}, 'status': 'pending'},
+                {'$set': {'status': 'sending', 'claimed_at': time.time()}}
+            )
+            return True
+        except Exception as e:
+            logger.error(f"Error claiming scheduled broadcasts: {e}")
+            return False
+
+    def bulk_update_scheduled_broadcasts(self, operations: List[UpdateOne]):
+        """Apply a tick's worth of completion/reschedule updates in one round-trip"""
+        try:
+            if operations:
+                self.scheduled_broadcasts_collection.bulk_write(operations, ordered=False)
+        except Exception as e:
+            logger.error(f"Error bulk updating scheduled broadcasts: {e}")
+
     def get_scheduled_broadcasts(self, created_by: int = None) -> List[Dict]:
         """Get all scheduled broadcasts"""
         try:
@@ -1427,6 +2029,20 @@ class MongoDBHandler:
             logger.error(f"Error getting suggester stats: {e}")
             return []
 
+    def get_leaderboard_privacy(self, user_ids: List[int]) -> Dict[int, bool]:
+        """Get the leaderboard_public flag for several users in one query"""
+        try:
+            return {
+                doc['user_id']: doc.get('leaderboard_public', True)
+                for doc in self.users_collection.find(
+                    {'user_id': {'$in': list(user_ids)}},
+                    {'_id': 0, 'user_id': 1, 'leaderboard_public': 1}
+                )
+            }
+        except Exception as e:
+            logger.error(f"Error getting leaderboard privacy flags: {e}")
+            return {}
+
     def get_admin_performance_stats(self, time_frame: str) -> List[Dict]:
         """Get admin performance stats including Duty Consistency"""
         try:
@@ -1516,7 +2132,7 @@ class MongoDBHandler:
         """Count user's suggestions since midnight UTC today"""
         try:
             today_utc = datetime.now(timezone.utc).date()
-            start_of_today_timestamp = datetime.combine(today_utc, dt_time(0, 0, tzinfo=timezone.utc)).timestamp()
+            start_of_today_timestamp = datetime.combine(today_utc, UTC_MIDNIGHT).timestamp()
 
             count = self.signal_suggestions_collection.count_documents({
                 'suggested_by': user_id,
@@ -1527,6 +2143,48 @@ class MongoDBHandler:
             logger.error(f"Error counting today's suggestions for {user_id}: {e}")
             return 0 
 
+    def get_user_suggestion_context(self, user_id: int) -> Dict:
+        """Fetch the rating/achievement fields and today's suggestion count in one query"""
+        try:
+            today_utc = datetime.now(timezone.utc).date()
+            start_of_today_timestamp = datetime.combine(today_utc, UTC_MIDNIGHT).timestamp()
+
+            pipeline = [
+                {'$match': {'user_id': user_id}},
+                {'$limit': 1},
+                {
+                    '$lookup': {
+                        'from': 'signal_suggestions',
+                        'let': {'uid': '$user_id'},
+                        'pipeline': [
+                            {
+                                '$match': {
+                                    'created_at': {'$gte': start_of_today_timestamp},
+                                    '$expr': {'$eq': ['$suggested_by', '$$uid']}
+                                }
+                            },
+                            {'$count': 'n'}
+                        ],
+                        'as': 'today'
+                    }
+                },
+                {
+                    '$project': {
+                        'avg_rating': 1,
+                        'achievements': 1,
+                        'referrals': 1,
+                        'today_count': {'$ifNull': [{'$arrayElemAt': ['$today.n', 0]}, 0]}
+                    }
+                }
+            ]
+            result = list(self.users_collection.aggregate(pipeline))
+            if result:
+                user = result[0]
+                return {'user': user, 'today_count': user.pop('today_count')}
+        except Exception as e:
+            logger.error(f"Error getting suggestion context for {user_id}: {e}")
+        return {'user': None, 'today_count': self.get_user_suggestions_today(user_id)}
+
     def get_user_average_rating(self, user_id: int) -> float:
         """Get user's average rating from approved signals"""
         try:
@@ -1553,6 +2211,18 @@ class MongoDBHandler:
             logger.error(f"Error getting user average rating for {user_id}: {e}")
             return 0.0 
 
+    def refresh_user_average_rating(self, user_id: int) -> float:
+        """Recompute a user's average rating and store it on the user document"""
+        avg_rating = self.get_user_average_rating(user_id)
+        try:
+            self.users_collection.update_one(
+                {'user_id': user_id},
+                {'$set': {'avg_rating': avg_rating}}
+            )
+        except Exception as e:
+            logger.error(f"Error caching average rating for {user_id}: {e}")
+        return avg_rating
+
     def get_user_signal_stats(self, user_id: int) -> Dict:
         """Get a user's signal suggestion stats"""
         try:
@@ -1725,6 +2395,29 @@ class ImageWatermarker:
             logger.error(f"Error adding watermark: {e}")
             return image_bytes
 
+class ImageTextExtractor:
+    """OCR for user-submitted screenshots"""
+
+    MAX_DIMENSION = 1024
+
+    @staticmethod
+    def extract_text(image_bytes: bytes) -> str:
+        """Downscale, greyscale and OCR an image. Blocking; run it off the event loop."""
+        max_size = (ImageTextExtractor.MAX_DIMENSION, ImageTextExtractor.MAX_DIMENSION)
+        image = Image.open(io.BytesIO(image_bytes))
+        if image.width > max_size[0] or image.height > max_size[1]:
+            # JPEG only: let libjpeg decode at a reduced scale instead of full resolution
+            image.draft('L', max_size)
+        image = image.convert('L')
+        image.thumbnail(max_size, Image.Resampling.BILINEAR)
+        image = ImageOps.autocontrast(image)
+        return pytesseract.image_to_string(image)
+
+    @staticmethod
+    def extract_raw_text(image_bytes: bytes) -> str:
+        """OCR an image at full resolution. Blocking; run it off the event loop."""
+        return pytesseract.image_to_string(Image.open(io.BytesIO(image_bytes)))
+
 class EducationalContentManager:
     """Manages educational content from a Telegram database channel"""
     
@@ -1739,10 +2432,11 @@ class EducationalContentManager:
             background=True 
         )
         
-    async def process_and_save(self, message):
-        """Extract content from a message and save to DB"""
+    @staticmethod
+    def build_entry(message) -> Optional[Dict]:
+        """Extract the storable content of a message, or None if it has nothing to save"""
         if not message:
-            return False
+            return None
 
         content_type = 'text'
         file_id = None
@@ -1762,9 +2456,9 @@ class EducationalContentManager:
             content_type = 'document'
             file_id = message.document.file_id
         else:
-            return False 
+            return None
 
-        entry = {
+        return {
             'message_id': message.message_id,
             'chat_id': message.chat.id,
             'type': content_type,
@@ -1774,9 +2468,33 @@ class EducationalContentManager:
             'saved_at': time.time()
         }
 
+    def save_entries_bulk(self, entries: List[Dict]) -> int:
+        """Upsert several extracted entries in one bulk_write; returns how many were written"""
+        try:
+            if not entries:
+                return 0
+            self.educational_content_collection.bulk_write([
+                UpdateOne(
+                    {'message_id': entry['message_id'], 'chat_id': entry['chat_id']},
+                    {'$set': entry},
+                    upsert=True
+                )
+                for entry in entries
+            ], ordered=False)
+            return len(entries)
+        except Exception as e:
+            logger.error(f"Error bulk saving educational content: {e}")
+            return 0
+
+    async def process_and_save(self, message):
+        """Extract content from a message and save to DB"""
+        entry = self.build_entry(message)
+        if not entry:
+            return False
+
         try:
             self.educational_content_collection.update_one(
-                {'message_id': message.message_id, 'chat_id': message.chat.id},
+                {'message_id': entry['message_id'], 'chat_id': entry['chat_id']},
                 {'$set': entry},
                 upsert=True
             )
@@ -1793,21 +2511,20 @@ class EducationalContentManager:
         success = 0
         failed = 0
         
-        footer = "\n\n🔕 Disable: /settings then toggle off Daily Tips"
+        if content['type'] == 'text':
+            text_to_send = content['content'] + TIPS_FOOTER
+        else:
+            caption_to_send = (content.get('caption') or '') + TIPS_FOOTER
         
         for user_id in target_users:
             try:
                 if content['type'] == 'text':
-                    text_to_send = content['content'] + footer
                     await context.bot.send_message(chat_id=user_id, text=text_to_send)
                 elif content['type'] == 'photo':
-                    caption_to_send = (content.get('caption') or '') + footer
                     await context.bot.send_photo(chat_id=user_id, photo=content['file_id'], caption=caption_to_send)
                 elif content['type'] == 'video':
-                    caption_to_send = (content.get('caption') or '') + footer
                     await context.bot.send_video(chat_id=user_id, video=content['file_id'], caption=caption_to_send)
                 elif content['type'] == 'document':
-                    caption_to_send = (content.get('caption') or '') + footer
                     await context.bot.send_document(chat_id=user_id, document=content['file_id'], caption=caption_to_send)
                 success += 1
             except Exception as e:
@@ -1845,21 +2562,20 @@ class EducationalContentManager:
         success = 0
         failed = 0
         
-        footer = "\n\n🔕 Disable: /settings then toggle off Daily Tips"
+        if content['type'] == 'text':
+            text_to_send = content['content'] + TIPS_FOOTER
+        else:
+            caption_to_send = (content.get('caption') or '') + TIPS_FOOTER
         
         for user_id in target_users:
             try:
                 if content['type'] == 'text':
-                    text_to_send = content['content'] + footer
                     await context.bot.send_message(chat_id=user_id, text=text_to_send)
                 elif content['type'] == 'photo':
-                    caption_to_send = (content.get('caption') or '') + footer
                     await context.bot.send_photo(chat_id=user_id, photo=content['file_id'], caption=caption_to_send)
                 elif content['type'] == 'video':
-                    caption_to_send = (content.get('caption') or '') + footer
                     await context.bot.send_video(chat_id=user_id, video=content['file_id'], caption=caption_to_send)
                 elif content['type'] == 'document':
-                    caption_to_send = (content.get('caption') or '') + footer
                     await context.bot.send_document(chat_id=user_id, document=content['file_id'], caption=caption_to_send)
                 success += 1
             except:
@@ -1955,14 +2671,22 @@ class AdminDutyManager:
             'priority': 'medium'
         }
     }
+    CATEGORY_LABELS = {category: category.replace('_', ' ').title() for category in DUTY_CATEGORIES}
+    CONTINUOUS_DUTIES = frozenset({'signal_review', 'broadcast_approval', 'user_engagement', 'community_moderation'})
+    FINITE_TASKS = frozenset({'content_creation', 'quality_control', 'analytics_reporting'})
+    # Duty categories whose "was there any work today" check counts submissions in a collection
+    WORK_SOURCES = {
+        'signal_review': 'signal_suggestions',
+        'broadcast_approval': 'broadcast_approvals'
+    }
     
     def __init__(self, db):
         self.db = db
         self.admin_duties_collection = self.db['admin_duties']
-        self.CONTINUOUS_DUTIES = ['signal_review', 'broadcast_approval', 'user_engagement', 'community_moderation']
-        self.FINITE_TASKS = ['content_creation', 'quality_control', 'analytics_reporting']
         self.admin_duties_collection.create_index([('date', -1)])
         self.admin_duties_collection.create_index('admin_id')
+        self.admin_duties_collection.create_index([('date', -1), ('completed', 1)])
+        self.admin_duties_collection.create_index([('date', -1), ('admin_id', 1)])
 
     def credit_duty_for_action(self, admin_id: int, action: str) -> bool:
         """
@@ -1986,56 +2710,55 @@ class AdminDutyManager:
         if not duty_category:
             return False
         
-        duties_to_credit = list(self.admin_duties_collection.find({
-            'date': date_key,
-            'duty_category': duty_category,
-            'completed': False
-        }))
+        result = self.admin_duties_collection.update_many(
+            {
+                'date': date_key,
+                'duty_category': duty_category,
+                'completed': False
+            },
+            {
+                '$push': {
+                    'actions_taken': {
+                        'action': action,
+                        'by_admin': admin_id,
+                        'at': time.time()
+                    }
+                },
+                '$inc': {'action_count': 1}
+            }
+        )
         
-        if not duties_to_credit:
+        if not result.matched_count:
             return False
         
-        for duty in duties_to_credit:
-            self.admin_duties_collection.update_one(
-                {'_id': duty['_id']},
-                {
-                    '$push': {
-                        'actions_taken': {
-                            'action': action,
-                            'by_admin': admin_id,
-                            'at': time.time()
-                        }
-                    },
-                    '$inc': {'action_count': 1}
-                }
-            )
-        
-        logger.info(f"Credited {action} to {len(duties_to_credit)} admin(s) with {duty_category} duty")
+        logger.info(f"Credited {action} to {result.matched_count} admin(s) with {duty_category} duty")
         return True
 
-    def _check_if_work_existed(self, duty_category: str, date_key: str) -> bool:
-        """Check if there was work AND if it was handled by anyone"""
+    def _work_counts_for_day(self, date_key: str) -> Dict[str, int]:
+        """Count the day's submissions for every work-tracked duty category in one aggregate"""
         try:
             date_obj = datetime.strptime(date_key, '%Y-%m-%d')
             start_timestamp = date_obj.replace(tzinfo=timezone.utc).timestamp()
             end_timestamp = start_timestamp + 86400
-            
-            if duty_category == 'signal_review':
-                submitted = self.db['signal_suggestions'].count_documents({
-                    'created_at': {'$gte': start_timestamp, '$lt': end_timestamp}
-                })
-                return submitted > 0
-            
-            elif duty_category == 'broadcast_approval':
-                submitted = self.db['broadcast_approvals'].count_documents({
-                    'created_at': {'$gte': start_timestamp, '$lt': end_timestamp}
-                })
-                return submitted > 0
-                
-            return True
+
+            def count_stage(category: str) -> List[Dict]:
+                return [
+                    {'$match': {'created_at': {'$gte': start_timestamp, '$lt': end_timestamp}}},
+                    {'$group': {'_id': category, 'n': {'$sum': 1}}}
+                ]
+
+            (first_category, first_collection), *rest = self.WORK_SOURCES.items()
+            pipeline = count_stage(first_category) + [
+                {'$unionWith': {'coll': collection, 'pipeline': count_stage(category)}}
+                for category, collection in rest
+            ]
+
+            counts = dict.fromkeys(self.WORK_SOURCES, 0)
+            counts.update({doc['_id']: doc['n'] for doc in self.db[first_collection].aggregate(pipeline)})
+            return counts
         except Exception as e:
             logger.error(f"Error checking work existence: {e}")
-            return True 
+            return {}
 
     def auto_complete_duties_with_no_work(self) -> Dict[str, Dict]:
         """
@@ -2050,6 +2773,9 @@ class AdminDutyManager:
             'date': date_key,
             'completed': False
         }))
+        # Categories without a work source (or a failed count) default to "work existed"
+        work_counts = self._work_counts_for_day(date_key) if incomplete_duties else {}
+        updates = []
         
         results = {
             'auto_completed_no_work': {},
@@ -2062,10 +2788,10 @@ class AdminDutyManager:
             admin_id = duty['admin_id']
             admin_name = duty['admin_name']
             action_count = duty.get('action_count', 0)
-            had_work = self._check_if_work_existed(duty_category, date_key)
+            had_work = work_counts.get(duty_category, 1) > 0
             
             if not had_work:
-                self.admin_duties_collection.update_one(
+                updates.append(UpdateOne(
                     {'_id': duty['_id']},
                     {
                         '$set': {
@@ -2076,11 +2802,11 @@ class AdminDutyManager:
                             'completion_notes': 'System: No work was available today'
                         }
                     }
-                )
+                ))
                 results['auto_completed_no_work'].setdefault(duty_category, []).append(admin_name)
             
             elif action_count > 0:
-                self.admin_duties_collection.update_one(
+                updates.append(UpdateOne(
                     {'_id': duty['_id']},
                     {
                         '$set': {
@@ -2091,12 +2817,14 @@ class AdminDutyManager:
                             'completion_notes': f'System Verified: {action_count} actions recorded.'
                         }
                     }
-                )
+                ))
                 results['verified_complete'].setdefault(duty_category, []).append(f"{admin_name} ({action_count} actions)")
                 
             else:
                 results['left_incomplete'].setdefault(duty_category, []).append(admin_name)
         
+        if updates:
+            self.admin_duties_collection.bulk_write(updates, ordered=False)
         return results
 
     def get_completion_stats(self, days: int = 7) -> List[Dict]:
@@ -2151,7 +2879,7 @@ class AdminDutyManager:
     
     def get_date_key(self) -> str:
         """Get today's date as a key"""
-        return datetime.now(timezone.utc).strftime('%Y-%m-%d')
+        return format_utc_day(int(time.time() // 86400))
     
     def assign_daily_duties(self, admin_list: List[Dict]) -> Dict[int, Dict]:
         """
@@ -2269,6 +2997,19 @@ class AdminDutyManager:
         """Get admin's duty for today"""
         date_key = self.get_date_key()
         return self.admin_duties_collection.find_one({'date': date_key, 'admin_id': admin_id})
+
+    def iter_incomplete_duties(self, batch_size: int = 100):
+        """Yield today's incomplete duties with only the fields a reminder needs"""
+        return self.admin_duties_collection.find(
+            {'date': self.get_date_key(), 'completed': False},
+            {
+                '_id': 0,
+                'admin_id': 1,
+                'duty_info.emoji': 1,
+                'duty_info.name': 1,
+                'duty_info.target': 1
+            }
+        ).batch_size(batch_size)
     
 class TwitterIntegration:
     """Auto-post bot content to Twitter with proper Threading"""
@@ -2279,22 +3020,33 @@ class TwitterIntegration:
         self.access_token = os.getenv('TWITTER_ACCESS_TOKEN')
         self.access_secret = os.getenv('TWITTER_ACCESS_SECRET')
         
-        if all([self.api_key, self.api_secret, self.access_token, self.access_secret]):
-            auth = tweepy.OAuthHandler(self.api_key, self.api_secret)
-            auth.set_access_token(self.access_token, self.access_secret)
-            self.client = tweepy.Client(
-                consumer_key=self.api_key,
-                consumer_secret=self.api_secret,
-                access_token=self.access_token,
-                access_token_secret=self.access_secret
-            )
-            self.api = tweepy.API(auth)
+        self.enabled = all([self.api_key, self.api_secret, self.access_token, self.access_secret])
+        if self.enabled:
             logger.info("Twitter integration enabled")
         else:
-            self.client = None
-            self.api = None
             logger.warning("Twitter credentials not set")
 
+    @cached_property
+    def client(self) -> Optional[tweepy.Client]:
+        """Twitter v2 client, built on first use"""
+        if not self.enabled:
+            return None
+        return tweepy.Client(
+            consumer_key=self.api_key,
+            consumer_secret=self.api_secret,
+            access_token=self.access_token,
+            access_token_secret=self.access_secret
+        )
+
+    @cached_property
+    def api(self) -> Optional[tweepy.API]:
+        """Twitter v1.1 API (media uploads), built on first use"""
+        if not self.enabled:
+            return None
+        auth = tweepy.OAuthHandler(self.api_key, self.api_secret)
+        auth.set_access_token(self.access_token, self.access_secret)
+        return tweepy.API(auth)
+
     def _clean_html(self, text: str) -> str:
         """Helper: Remove HTML tags for Twitter"""
         return re.sub(r'<[^>]+>', '', text)
@@ -2383,7 +3135,7 @@ class TwitterIntegration:
 
     async def post_general_broadcast(self, context, message_data: Dict) -> Optional[str]:
         """Post a general broadcast to Twitter with threading support"""
-        if not self.client:
+        if not self.enabled:
             return None
         
         try:
@@ -2434,7 +3186,7 @@ class TwitterIntegration:
 
     async def post_signal(self, context, suggestion: Dict) -> Optional[str]:
         """Post approved signal to Twitter"""
-        if not self.client:
+        if not self.enabled:
             return None
         
         try:
@@ -2461,7 +3213,7 @@ class TwitterIntegration:
         
     async def post_daily_tip(self, context, content: Dict) -> Optional[str]:
         """Post daily tip with proper threading"""
-        if not self.client:
+        if not self.enabled:
             return None
         
         try:
@@ -2488,7 +3240,7 @@ class TwitterIntegration:
             return None
     
     async def post_performance_update(self, stats: Dict) -> Optional[str]:
-        if not self.client: return None
+        if not self.enabled: return None
         try:
             total = stats.get('total_signals', 0)
             avg = stats.get('avg_rating', 0)
@@ -2547,14 +3299,14 @@ class SupportManager:
 
     async def handle_app_message(self, context, user_id: int, content: str = None, image_data: bytes = None):
         """Handles message sent FROM the Mobile App (Text or Image)"""
-        support_group_id = self.db.get_support_group()
+        support_group_id = await asyncio.to_thread(self.db.get_support_group)
         if not support_group_id:
             return False, "Support unavailable"
 
-        user = self.db.users_collection.find_one({'user_id': user_id})
+        user = await asyncio.to_thread(self.db.users_collection.find_one, {'user_id': user_id})
         username = user.get('username', 'Unknown')
         first_name = user.get('first_name', str(user_id))
-        is_vip = self.db.is_subscriber(user_id)
+        is_vip = await asyncio.to_thread(self.db.is_subscriber, user_id)
         vip_tag = "💎 <b>VIP</b>" if is_vip else "👤 <b>Free</b>"
         
         text_header = (
@@ -2596,9 +3348,9 @@ class SupportManager:
                 'file_id': file_id,
                 'timestamp': time.time()
             }
-            self.db.db['support_messages'].insert_one(msg_entry)
+            await asyncio.to_thread(self.db.db['support_messages'].insert_one, msg_entry)
 
-            self.db.save_support_mapping(sent_msg.message_id, user_id)
+            await asyncio.to_thread(self.db.save_support_mapping, sent_msg.message_id, user_id)
             return True, "Sent"
 
         except Exception as e:
@@ -2707,6 +3459,11 @@ class SupportManager:
                 try: await update.message.set_reaction(reaction=[ReactionTypeEmoji("💔")])
                 except: pass
 
+class GreetingFilter(filters.MessageFilter):
+    """Matches messages whose whole text, trimmed and lowercased, is one of GREETING_TEXTS"""
+    def filter(self, message):
+        return bool(message.text) and message.text.strip().lower() in GREETING_TEXTS
+
 class ReplyContainsFilter(filters.MessageFilter):
     """
     Custom filter to check if the replied-to message contains specific text.
@@ -2723,12 +3480,171 @@ class ReplyContainsFilter(filters.MessageFilter):
             and self.text in message.reply_to_message.text
         )
 
+class TokenBucket:
+    """
+    Token bucket; acquire() reserves a token and returns how long to wait for it.
+    Not locked: only safe to use from the event-loop thread, which is the only
+    place the bot's requests (including the API server's) are made from.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+
+    def acquire(self) -> float:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+        self.tokens -= 1
+        return max(0.0, -self.tokens / self.rate)
+
+    def is_idle(self) -> bool:
+        return self.tokens + (time.monotonic() - self.updated_at) * self.rate >= self.capacity
+
+class TelegramRateLimiter(BaseRateLimiter):
+    """
+    Keeps Bot API calls under Telegram's flood limits: a global bucket for all
+    requests plus a per-chat bucket for groups and channels. Requests that still
+    hit a flood wait are retried after the delay Telegram asks for.
+    """
+
+    def __init__(self, overall_rate: float = 28, group_rate: float = 20 / 60, max_retries: int = 2):
+        self._overall = TokenBucket(overall_rate, overall_rate)
+        self._group_rate = group_rate
+        self._group_buckets: Dict[int, TokenBucket] = {}
+        self._max_retries = max_retries
+
+    async def initialize(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        pass
+
+    def _group_bucket(self, chat_id: int) -> TokenBucket:
+        bucket = self._group_buckets.get(chat_id)
+        if bucket is None:
+            if len(self._group_buckets) > 1000:
+                self._group_buckets = {
+                    cid: b for cid, b in self._group_buckets.items() if not b.is_idle()
+                }
+            bucket = self._group_buckets[chat_id] = TokenBucket(self._group_rate, 20)
+        return bucket
+
+    async def process_request(self, callback, args, kwargs, endpoint, data, rate_limit_args):
+        chat_id = data.get('chat_id')
+        is_group = isinstance(chat_id, str) or (isinstance(chat_id, int) and chat_id < 0)
+
+        for attempt in range(self._max_retries + 1):
+            delay = self._overall.acquire()
+            if is_group:
+                delay = max(delay, self._group_bucket(chat_id).acquire())
+            if delay:
+                await asyncio.sleep(delay)
+            try:
+                return await callback(*args, **kwargs)
+            except RetryAfter as e:
+                if attempt >= self._max_retries:
+                    raise
+                retry_after = e.retry_after
+                if isinstance(retry_after, timedelta):
+                    retry_after = retry_after.total_seconds()
+                logger.warning(f"Flood limit hit on {endpoint}, retrying in {retry_after}s")
+                await asyncio.sleep(retry_after)
+
+class PerChatUpdateProcessor(BaseUpdateProcessor):
+    """
+    Processes updates concurrently across conversations but in arrival order
+    within each (chat, user) pair, so ConversationHandler state and
+    context.user_data never see two updates from the same person at once.
+    """
+
+    def __init__(self, max_concurrent_updates: int):
+        super().__init__(max_concurrent_updates)
+        self._locks: Dict[Tuple[Optional[int], Optional[int]], List] = {}
+
+    async def initialize(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        pass
+
+    async def process_update(self, update, coroutine) -> None:
+        """Wait for the (chat, user) turn before taking one of the global concurrency slots"""
+        chat = getattr(update, 'effective_chat', None)
+        user = getattr(update, 'effective_user', None)
+        if chat is None and user is None:
+            await super().process_update(update, coroutine)
+            return
+
+        key = (chat.id if chat else None, user.id if user else None)
+        # [lock, updates holding or waiting on it]; the entry is evicted once the count drops to 0
+        entry = self._locks.get(key)
+        if entry is None:
+            entry = self._locks[key] = [asyncio.Lock(), 0]
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                await super().process_update(update, coroutine)
+        finally:
+            entry[1] -= 1
+            if not entry[1]:
+                del self._locks[key]
+
+    async def do_process_update(self, update, coroutine) -> None:
+        await coroutine
+
 class BroadcastBot:
+    _RATING_TABLE = (
+        (4, 5, "Premium (4-5 Star)"),
+        (3, 2, "Standard (3 Star)"),
+        (float('-inf'), 1, "Basic (0-2 Star)"),
+    )
+    # Errors that mean the user is gone for good; other Forbidden errors (e.g. "bot can't
+    # initiate conversation") don't justify deleting their records
+    _BLOCK_INDICATORS = (
+        "bot was blocked",
+        "user is deactivated",
+        "chat not found",
+    )
+    _ACHIEVEMENT_BONUSES = {'approved_signal': 1, 'consistent': 1}
+    # Ascending thresholds; bisect_right picks the label of the highest threshold reached
+    _SUGGESTER_TIER_THRESHOLDS = (3.5, 4.0, 4.5)
+    _SUGGESTER_TIER_LABELS = ("📊 Active", "🔷 Advanced", "💎 Expert", "⭐ Elite")
+    _ADMIN_LEVEL_THRESHOLDS = (3, 6, 12, 20)
+    _ADMIN_LEVEL_LABELS = ("💤 Low Activity", "📊 Contributing", "✅ Active", "⚡ High Impact", "🔥 Exceptional")
+    _DUTY_RATE_THRESHOLDS = (50, 80)
+    _DUTY_RATE_EMOJIS = ("🔴", "🟡", "🟢")
+    # (required permission, super admin only, button) in display order
+    _ADMIN_MENU_SPEC = (
+        (None, False, InlineKeyboardButton("📢 Broadcasting", callback_data='admin_broadcast')),
+        (Permission.APPROVE_BROADCASTS, False, InlineKeyboardButton("✅ Approval System", callback_data='admin_approvals')),
+        (None, False, InlineKeyboardButton("📝 Templates", callback_data='admin_templates')),
+        (None, False, InlineKeyboardButton("📋 Team Duties & QA", callback_data='admin_duties')),
+        (None, True, InlineKeyboardButton("📚 Content & Education", callback_data='admin_content')),
+        (None, False, InlineKeyboardButton("👥 User Management", callback_data='admin_users')),
+        (Permission.MANAGE_ADMINS, False, InlineKeyboardButton("👨‍💼 Admin Management", callback_data='admin_admins')),
+        (Permission.VIEW_LOGS, False, InlineKeyboardButton("📊 Monitoring", callback_data='admin_monitoring')),
+        (None, False, InlineKeyboardButton("❓ Help", callback_data='admin_help')),
+    )
+    _admin_menu_markups: Dict[tuple, InlineKeyboardMarkup] = {}
+    # message_data['type'] -> (Bot method, media keyword); text goes through send_message
+    _MEDIA_SENDERS = {
+        'photo': ('send_photo', 'photo'),
+        'video': ('send_video', 'video'),
+        'document': ('send_document', 'document'),
+    }
+    _SIGNAL_RATING_MARKUP = InlineKeyboardMarkup([[
+        InlineKeyboardButton('⭐' * i, callback_data=f"sig_rate_{i}") for i in range(1, 6)
+    ]])
+
     def __init__(self, token: str, super_admin_ids: List[int], mongo_handler: MongoDBHandler):
         self.token = token
-        self.super_admin_ids = super_admin_ids
+        self.super_admin_ids = frozenset(super_admin_ids)
         self.db = mongo_handler
         self.watermarker = ImageWatermarker()
+        self._ocr_semaphore = asyncio.Semaphore(OCR_CONCURRENCY)
         self.support_manager = SupportManager(self.db, self.super_admin_ids)
         
         self.engagement_tracker = UserEngagementTracker(self.db)
@@ -2738,6 +3654,10 @@ class BroadcastBot:
         self.achievement_system = AchievementSystem()
         self.twitter = TwitterIntegration()
 
+        self.force_sub_channel = os.getenv('FORCE_SUB_CHANNEL')
+        self.channel_link = f"https://t.me/{self.force_sub_channel.lstrip('@')}" if self.force_sub_channel else None
+        self._sub_cache: Dict[int, tuple] = {}
+
         self.finnhub_client = None
         if FINNHUB_API_KEY:
             try:
@@ -2747,6 +3667,10 @@ class BroadcastBot:
                 logger.error(f"Failed to initialize Finnhub client: {e}")
 
         EDUCATION_CHANNEL_ID = os.getenv('EDUCATION_CHANNEL_ID')
+        try:
+            self._edu_channel_id_int = int(EDUCATION_CHANNEL_ID) if EDUCATION_CHANNEL_ID else None
+        except ValueError:
+            self._edu_channel_id_int = None
         if EDUCATION_CHANNEL_ID:
             self.edu_content_manager = EducationalContentManager(
                 self.db.db, 
@@ -2758,8 +3682,20 @@ class BroadcastBot:
             logger.warning("EDUCATION_CHANNEL_ID not set. Educational content feature disabled.")
         self.admin_duty_manager = AdminDutyManager(self.db.db)
         logger.info("Admin Duty Manager initialized")
-        
-        self.cr_numbers = {
+        self._admin_cache: Dict[int, AdminRole] = {}
+        self._admin_cache_expires = 0.0
+        self._refresh_admin_cache()
+        self._pending_achievement_checks: set = set()
+        self._bg_tasks: set = set()
+        self._pending_edu_saves: Dict[Tuple[int, int], Dict] = {}
+        self._super_admin_digest: Dict[int, List[str]] = {}
+        self._daily_summary_cache: Dict[str, Tuple[tuple, str]] = {}
+        self._duty_html_cache: Dict[str, str] = {}
+        self._push_session: Optional[aiohttp.ClientSession] = None
+        self._api_runner: Optional[web.AppRunner] = None
+        self.api_port = 8000
+        
+        self.cr_numbers = frozenset(cr.strip().upper() for cr in (
             "CR5499637", "CR5500382", "CR5529877", "CR5535613", "CR5544922", "CR5551288",
             "CR5552176", "CR5556284", "CR5556287", "CR5561483", "CR5563616", "CR5577880",
             "CR5585327", "CR5589802", "CR5592846", "CR5594968", "CR5595416", "CR5597602",
@@ -2822,7 +3758,7 @@ class BroadcastBot:
             "CR7816651", "CR7817244", "CR7818330", "CR5149678", "CR8010847", "CR8036589",
             "CR8047034", "CR8052255", "CR7380411", "CR7707424", "CR8581785", "CR8644473",
             "CR8648274", "CR8661054",
-        }
+        ))
 
     async def handle_platform_choice(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         query = update.callback_query
@@ -2861,6 +3797,7 @@ class BroadcastBot:
         success = self.db.delete_user_fully(user_id)
         
         if success:
+            self._refresh_admin_cache()
             logger.info(f"✅ Scheduled deletion completed for {user_id}")
             try:
                 await context.bot.send_message(
@@ -2905,26 +3842,35 @@ class BroadcastBot:
         if not fallback_admins:
             return
 
-        for admin_id in set(fallback_admins):
-            try:
-                if photo:
-                    if hasattr(photo, 'seek'): photo.seek(0)
-                    await self.application.bot.send_photo(
-                        chat_id=admin_id,
-                        photo=photo,
-                        caption=text,
-                        reply_markup=reply_markup,
-                        parse_mode=ParseMode.HTML
-                    )
-                else:
-                    await self.application.bot.send_message(
-                        chat_id=admin_id,
-                        text=text,
-                        reply_markup=reply_markup,
-                        parse_mode=ParseMode.HTML
-                    )
-            except Exception as e:
-                logger.error(f"Failed to notify admin {admin_id}: {e}")
+        if photo and hasattr(photo, 'read'):
+            # A shared stream can't be uploaded concurrently; send its bytes instead
+            if hasattr(photo, 'seek'): photo.seek(0)
+            photo = photo.read()
+
+        await asyncio.gather(*(
+            self._notify_admin(admin_id, text, photo, reply_markup) for admin_id in set(fallback_admins)
+        ))
+
+    async def _notify_admin(self, admin_id: int, text: str, photo=None, reply_markup=None):
+        """DM a single admin, logging rather than raising on failure"""
+        try:
+            if photo:
+                await self.application.bot.send_photo(
+                    chat_id=admin_id,
+                    photo=photo,
+                    caption=text,
+                    reply_markup=reply_markup,
+                    parse_mode=ParseMode.HTML
+                )
+            else:
+                await self.application.bot.send_message(
+                    chat_id=admin_id,
+                    text=text,
+                    reply_markup=reply_markup,
+                    parse_mode=ParseMode.HTML
+                )
+        except Exception as e:
+            logger.error(f"Failed to notify admin {admin_id}: {e}")
 
     async def handle_deletion_approval(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle the admin clicking 'Approve Deletion'"""
@@ -3003,7 +3949,7 @@ class BroadcastBot:
         self.db.log_activity(admin_id, 'vip_declined', {'user_id': target_user_id, 'reason': reason})
         self.admin_duty_manager.credit_duty_for_action(admin_id, 'vip_declined')
 
-        asyncio.create_task(self.send_push_to_users(
+        self._spawn(self.send_push_to_users(
             [target_user_id], "VIP Request Declined", f"Reason: {reason}",
             data={'screen': 'Home'}
         ))
@@ -3025,13 +3971,13 @@ class BroadcastBot:
             results = self.admin_duty_manager.auto_complete_duties_with_no_work()
             
             summary = "🤖 <b>End-of-Day Duty Report</b>\n"
-            summary += f"Date: {datetime.now(timezone.utc).strftime('%Y-%m-%d')}\n\n"
+            summary += f"Date: {self.admin_duty_manager.get_date_key()}\n\n"
             
             if results['auto_completed_no_work']:
                 summary += "✅ <b>Auto-Completed (No Work):</b>\n"
                 for category, admins in results['auto_completed_no_work'].items():
                     duty_name = self.admin_duty_manager.DUTY_CATEGORIES[category]['emoji']
-                    summary += f"{duty_name} {category.replace('_', ' ').title()}:\n"
+                    summary += f"{duty_name} {self.admin_duty_manager.CATEGORY_LABELS[category]}:\n"
                     for admin in admins:
                         summary += f"  • {admin}\n"
                 summary += "\n"
@@ -3040,7 +3986,7 @@ class BroadcastBot:
                 summary += "🤝 <b>Auto-Completed (Team Coverage):</b>\n"
                 for category, admins in results['auto_completed_covered'].items():
                     duty_name = self.admin_duty_manager.DUTY_CATEGORIES[category]['emoji']
-                    summary += f"{duty_name} {category.replace('_', ' ').title()}:\n"
+                    summary += f"{duty_name} {self.admin_duty_manager.CATEGORY_LABELS[category]}:\n"
                     for admin in admins:
                         summary += f"  • {admin}\n"
                 summary += "\n"
@@ -3049,7 +3995,7 @@ class BroadcastBot:
                 summary += "⚠️ <b>Incomplete (Work Not Done):</b>\n"
                 for category, admins in results['left_incomplete'].items():
                     duty_name = self.admin_duty_manager.DUTY_CATEGORIES[category]['emoji']
-                    summary += f"{duty_name} {category.replace('_', ' ').title()}:\n"
+                    summary += f"{duty_name} {self.admin_duty_manager.CATEGORY_LABELS[category]}:\n"
                     for admin in admins:
                         summary += f"  • {admin} ❌\n"
                 summary += "\n"
@@ -3072,25 +4018,32 @@ class BroadcastBot:
         except Exception as e:
             logger.error(f"Error in end_of_day_duty_verification_job: {e}")
 
+    async def prune_sub_cache(self, context: ContextTypes.DEFAULT_TYPE):
+        """Drop expired force-sub membership entries so the cache only holds recently seen users"""
+        now = time.time()
+        self._sub_cache = {uid: entry for uid, entry in self._sub_cache.items() if entry[1] > now}
+
     async def is_user_subscribed(self, user_id: int, context: ContextTypes.DEFAULT_TYPE) -> bool:
         """Check if a user is subscribed to the force-sub channel"""
-        FORCE_SUB_CHANNEL = os.getenv('FORCE_SUB_CHANNEL')
-        if not FORCE_SUB_CHANNEL:
+        if not self.force_sub_channel:
             return True
 
         if self.is_admin(user_id):
             return True
 
+        cached = self._sub_cache.get(user_id)
+        if cached and cached[1] > time.time():
+            return cached[0]
+
         try:
-            member = await context.bot.get_chat_member(chat_id=FORCE_SUB_CHANNEL, user_id=user_id)
-            if member.status in ['member', 'administrator', 'creator']:
-                return True
-            else:
-                return False
+            member = await context.bot.get_chat_member(chat_id=self.force_sub_channel, user_id=user_id)
+            result = member.status in ['member', 'administrator', 'creator']
+            self._sub_cache[user_id] = (result, time.time() + SUB_CACHE_TTL)
+            return result
         except BadRequest as e:
             if "user not found" in e.message or "chat not found" in e.message:
                 if "chat not found" in e.message:
-                    logger.error(f"Force-sub error: Bot cannot access channel {FORCE_SUB_CHANNEL}. Is it an admin there?")
+                    logger.error(f"Force-sub error: Bot cannot access channel {self.force_sub_channel}. Is it an admin there?")
                 return False
         except Exception as e:
             logger.error(f"Error in is_user_subscribed for {user_id}: {e}")
@@ -3098,14 +4051,11 @@ class BroadcastBot:
 
     async def send_join_channel_message(self, chat_id: int, context: ContextTypes.DEFAULT_TYPE):
         """Sends the 'please join' message"""
-        FORCE_SUB_CHANNEL = os.getenv('FORCE_SUB_CHANNEL')
-        if not FORCE_SUB_CHANNEL:
+        if not self.force_sub_channel:
             return
 
-        channel_link = f"https://t.me/{FORCE_SUB_CHANNEL.lstrip('@')}"
-
         keyboard = [
-            [InlineKeyboardButton("Join Channel", url=channel_link)],
+            [InlineKeyboardButton("Join Channel", url=self.channel_link)],
             [InlineKeyboardButton("I've Joined", callback_data="check_joined")]
         ]
         reply_markup = InlineKeyboardMarkup(keyboard)
@@ -3121,6 +4071,7 @@ class BroadcastBot:
         user_id = query.from_user.id
         await query.answer("Checking...")
 
+        self._sub_cache.pop(user_id, None)
         if await self.is_user_subscribed(user_id, context):
             await query.edit_message_text("✅ Thank you! You can now use the bot.\n\nTry sending /start again.")
         else:
@@ -3133,9 +4084,55 @@ class BroadcastBot:
         for admin_id in super_admin_ids:
             self.db.add_admin(admin_id, AdminRole.SUPER_ADMIN, admin_id)
 
+    def _refresh_admin_cache(self):
+        """Reload the in-memory admin role cache from the database"""
+        self._admin_cache_expires = time.time() + ADMIN_CACHE_TTL
+        roles = self.db.get_admin_roles()
+        if roles is not None:
+            self._admin_cache = roles
+
     def get_admin_role(self, user_id: int) -> Optional[AdminRole]:
         """Get user's admin role"""
-        return self.db.get_admin_role(user_id)
+        if time.time() >= self._admin_cache_expires:
+            self._refresh_admin_cache()
+        return self._admin_cache.get(user_id)
+
+    def get_admins_with_permission(self, permission: Permission) -> List[int]:
+        """IDs of all admins whose role grants permission, straight from the role cache"""
+        if time.time() >= self._admin_cache_expires:
+            self._refresh_admin_cache()
+        return [
+            user_id for user_id, role in self._admin_cache.items()
+            if permission in ROLE_PERMISSION_SETS.get(role, frozenset())
+        ]
+
+    def _admin_main_menu(self, admin_ctx: AdminContext) -> (str, InlineKeyboardMarkup):
+        """Admin panel header and keyboard for the given admin"""
+        text = (
+            f"🔧 <b>Admin Panel</b> ({admin_ctx.role.value.replace('_', ' ').title()})\n\n"
+            "Welcome to the Admin Control Center. Select a category to manage."
+        )
+        cache_key = (admin_ctx.permissions, admin_ctx.is_super)
+        reply_markup = self._admin_menu_markups.get(cache_key)
+        if reply_markup is None:
+            reply_markup = InlineKeyboardMarkup([
+                [button] for permission, super_only, button in self._ADMIN_MENU_SPEC
+                if (permission is None or permission in admin_ctx.permissions)
+                and (not super_only or admin_ctx.is_super)
+            ])
+            self._admin_menu_markups[cache_key] = reply_markup
+        return text, reply_markup
+
+    def _load_admin_context(self, user_id: int) -> Optional[AdminContext]:
+        """Resolve an admin's role and permissions in one lookup"""
+        role = self.get_admin_role(user_id)
+        if role is None:
+            return None
+        return AdminContext(
+            role=role,
+            permissions=ROLE_PERMISSION_SETS.get(role, frozenset()),
+            is_super=user_id in self.super_admin_ids
+        )
 
     def is_admin(self, user_id: int) -> bool:
         """Check if user is any type of admin"""
@@ -3143,36 +4140,42 @@ class BroadcastBot:
 
     def has_permission(self, user_id: int, permission: Permission) -> bool:
         """Check if user has specific permission"""
-        return self.db.has_permission(user_id, permission)
+        role = self.get_admin_role(user_id)
+        if not role:
+            return False
+        return permission in ROLE_PERMISSIONS.get(role, [])
 
     def needs_approval(self, user_id: int) -> bool:
         """Check if user's broadcasts need approval"""
         role = self.get_admin_role(user_id)
         return role in [AdminRole.BROADCASTER, AdminRole.ADMIN]
 
-    def get_user_suggestion_limit(self, user_id: int) -> (int, str):
+    def _user_avg_rating(self, user_id: int, user: Optional[Dict]) -> float:
+        """Average rating from the cached user field, computing it if missing"""
+        if user and 'avg_rating' in user:
+            return user['avg_rating']
+        return self.db.refresh_user_average_rating(user_id)
+
+    def get_user_suggestion_limit(self, user_id: int, user: Optional[Dict] = None) -> (int, str):
         """Determines a user's suggestion limit and level based on rating AND achievements"""
         
-        avg_rating = self.db.get_user_average_rating(user_id)
-
-        if avg_rating >= 4:
-            base_limit = 5
-            level = "Premium (4-5 Star)"
-        elif avg_rating >= 3:
-            base_limit = 2
-            level = "Standard (3 Star)"
-        else: # < 3 or 0
-            base_limit = 1
-            level = "Basic (0-2 Star)"
+        if user is None:
+            user = self.db.users_collection.find_one(
+                {'user_id': user_id},
+                {'avg_rating': 1, 'achievements': 1, 'referrals': 1}
+            )
+        avg_rating = self._user_avg_rating(user_id, user)
+
+        for threshold, base_limit, level in self._RATING_TABLE:
+            if avg_rating >= threshold:
+                break
         bonus = 0
-        user = self.db.users_collection.find_one({'user_id': user_id})
         
         if user and 'achievements' in user:
             achievements = user['achievements']
-            if 'approved_signal' in achievements:
-                bonus += 1
-            if 'consistent' in achievements:
-                bonus += 1
+            bonus += sum(
+                value for key, value in self._ACHIEVEMENT_BONUSES.items() if key in achievements
+            )
             if 'elite' in achievements:
                 base_limit = 100
                 level = "💎 Elite Trader"
@@ -3196,15 +4199,11 @@ class BroadcastBot:
             await query.answer("❌ Not authorized", show_alert=True)
             return
 
-        action, suggestion_id = query.data.split('_', 2)[1:]
+        action, _, suggestion_id = query.data.partition('_')[2].partition('_')
         
         if action == "approve":
             keyboard = [[
-                InlineKeyboardButton("1⭐", callback_data=f"sig_rate_1_{suggestion_id}"),
-                InlineKeyboardButton("2⭐", callback_data=f"sig_rate_2_{suggestion_id}"),
-                InlineKeyboardButton("3⭐", callback_data=f"sig_rate_3_{suggestion_id}"),
-                InlineKeyboardButton("4⭐", callback_data=f"sig_rate_4_{suggestion_id}"),
-                InlineKeyboardButton("5⭐", callback_data=f"sig_rate_5_{suggestion_id}")
+                InlineKeyboardButton(f"{i}⭐", callback_data=f"sig_rate_{i}_{suggestion_id}") for i in range(1, 6)
             ]]
             await query.edit_message_reply_markup(reply_markup=InlineKeyboardMarkup(keyboard))
 
@@ -3225,12 +4224,13 @@ class BroadcastBot:
         rating = int(parts[2])
         suggestion_id = parts[3]
 
-        suggestion = self.db.get_suggestion_by_id(suggestion_id)
+        suggestion = await asyncio.to_thread(self.db.approve_suggestion, suggestion_id, query.from_user.id, rating)
         if not suggestion:
-            await query.answer("❌ Error: Signal not found", show_alert=True)
-            return
+            suggestion = self.db.get_suggestion_by_id(suggestion_id)
+            if not suggestion or suggestion.get('status') != 'approved':
+                await query.answer("❌ Error: Signal not found", show_alert=True)
+                return
 
-        if suggestion.get('status') == 'approved':
             await query.answer("⚠️ This signal is already approved!", show_alert=True)
             try:
                 original_caption = query.message.caption
@@ -3248,14 +4248,14 @@ class BroadcastBot:
 
         await query.answer()
 
-        self.db.update_suggestion_status(suggestion_id, 'approved', query.from_user.id, rating=rating)
         self.admin_duty_manager.credit_duty_for_action(query.from_user.id, 'signal_approved')
         
         suggester_id = suggestion['suggested_by']
-        self.engagement_tracker.update_engagement(suggester_id, 'signal_approved')
-        if rating == 5: self.engagement_tracker.update_engagement(suggester_id, 'signal_5_star')
+        self.engagement_tracker.update_engagement_many(
+            suggester_id, {'signal_approved': 1, 'signal_5_star': 1} if rating == 5 else {'signal_approved': 1}
+        )
         
-        await self.achievement_system.check_and_award_achievements(suggester_id, context, self.db)
+        self._pending_achievement_checks.add(suggester_id)
         await self.broadcast_signal(context, suggestion)
 
         try:
@@ -3301,12 +4301,13 @@ class BroadcastBot:
         """Updated Broadcast Approval to use ForceReply for rejections."""
         query = update.callback_query
         await query.answer()
+        admin_id = query.from_user.id
 
-        if not self.has_permission(query.from_user.id, Permission.APPROVE_BROADCASTS):
+        if not self.has_permission(admin_id, Permission.APPROVE_BROADCASTS):
             await query.answer("❌ Not authorized", show_alert=True)
             return
 
-        action, approval_id = query.data.split('_', 2)[1:]
+        action, _, approval_id = query.data.partition('_')[2].partition('_')
         approval = self.db.get_approval_by_id(approval_id)
         
         if not approval:
@@ -3314,9 +4315,9 @@ class BroadcastBot:
             return
 
         if action == "approve":
-            self.db.update_approval_status(approval_id, 'approved', query.from_user.id)
-            self.admin_duty_manager.credit_duty_for_action(query.from_user.id, 'broadcast_approved')
-            await self.execute_approved_broadcast(context, approval, query.from_user.id)
+            self.db.update_approval_status(approval_id, 'approved', admin_id)
+            self.admin_duty_manager.credit_duty_for_action(admin_id, 'broadcast_approved')
+            await self.execute_approved_broadcast(context, approval, admin_id)
             
             try:
                 await context.bot.send_message(approval['created_by'], "✅ Your broadcast was approved!")
@@ -3379,83 +4380,21 @@ class BroadcastBot:
             await self.send_join_channel_message(user_id, context)
             return
 
-        self.db.add_user(user_id, user.username, user.first_name)
-        self.engagement_tracker.update_engagement(user_id, 'command_used') # Track engagement
-        
-        user_doc = self.db.users_collection.find_one({'user_id': user_id})
-        is_new = not user_doc.get('welcomed', False)
-
-        if self.is_admin(user_id):
-            role = self.get_admin_role(user_id)
-            admin_main_menu_text = (
-                f"🔧 <b>Admin Panel</b> ({role.value.replace('_', ' ').title()})\n\n"
-                "Welcome to the Admin Control Center. Select a category to manage."
-            )
-
-            keyboard = [
-                [InlineKeyboardButton("📢 Broadcasting", callback_data='admin_broadcast')],
-            ]
-            if self.has_permission(user_id, Permission.APPROVE_BROADCASTS):
-                keyboard.append([InlineKeyboardButton("✅ Approval System", callback_data='admin_approvals')])
-            
-            keyboard.append([InlineKeyboardButton("📝 Templates", callback_data='admin_templates')])
+        user_doc = self.db.upsert_user(user_id, user.username, user.first_name, extra_fields={'welcomed': True})
+        self.engagement_tracker.queue_engagement(user_id, 'command_used') # Track engagement
         
-            if self.is_admin(user_id):
-                keyboard.append([InlineKeyboardButton("📋 Team Duties & QA", callback_data='admin_duties')])
-                
-            if user_id in self.super_admin_ids: 
-                 keyboard.append([InlineKeyboardButton("📚 Content & Education", callback_data='admin_content')])
-            
-            keyboard.append([InlineKeyboardButton("👥 User Management", callback_data='admin_users')])
-            
-            if self.has_permission(user_id, Permission.MANAGE_ADMINS):
-                keyboard.append([InlineKeyboardButton("👨‍💼 Admin Management", callback_data='admin_admins')])
-            
-            if self.has_permission(user_id, Permission.VIEW_LOGS):
-                keyboard.append([InlineKeyboardButton("📊 Monitoring", callback_data='admin_monitoring')])
-            
-            keyboard.append([InlineKeyboardButton("❓ Help", callback_data='admin_help')])
+        is_new = not (user_doc or {}).get('welcomed', False)
 
-            reply_markup = InlineKeyboardMarkup(keyboard)
+        admin_ctx = self._load_admin_context(user_id)
+        if admin_ctx:
+            admin_main_menu_text, reply_markup = self._admin_main_menu(admin_ctx)
             
             await update.message.reply_text(admin_main_menu_text, reply_markup=reply_markup, parse_mode=ParseMode.HTML)
         else:
             if is_new:
-                welcome = (
-                    f"👋 <b>Welcome to PipSage, {user.first_name}!</b>\n\n"
-                    
-                    "📈 We're a community of <b>serious traders</b> who:\n"
-                    "• Share high-quality signals\n"
-                    "• Learn risk management together\n"
-                    "• Use powerful trading tools\n\n"
-                    
-                    "🎯 <b>Get Started:</b>\n"
-                    "/subscribe - Join VIP for premium signals\n"
-                    "/positionsize - Calculate lot size for risk\n"
-                    "/settings - Manage your notifications\n"
-                    "/help - Show all commands\n\n"
-                    
-                    "💡 <b>Become a Contributor:</b>\n"
-                    "Earn status by sharing quality signals with /suggestsignal\n\n"
-                    
-                    "<i>Enable notifications to never miss important updates!</i>"
-                )
-                
-                self.db.users_collection.update_one(
-                    {'user_id': user_id},
-                    {'$set': {'welcomed': True}}
-                )
+                welcome = WELCOME_NEW_TEMPLATE.format(name=user.first_name)
             else:
-                welcome = (
-                    f"Welcome back, {user.first_name}! 👋\n\n"
-                    
-                    "Quick access:\n"
-                    "/mystats - Your performance\n"
-                    "/myprogress - Your signal progress\n" 
-                    "/referral - Refer friends\n" 
-                    "/subscribe - VIP access\n"
-                    "/help - All commands"
-                )
+                welcome = WELCOME_BACK_TEMPLATE.format(name=user.first_name)
             
             await update.message.reply_text(welcome, parse_mode=ParseMode.HTML)
 
@@ -3464,155 +4403,32 @@ class BroadcastBot:
         await query.answer()
         user_id = query.from_user.id
         
-        if not self.is_admin(user_id):
+        admin_ctx = self._load_admin_context(user_id)
+        if not admin_ctx:
             await query.edit_message_text("You are not authorized to use these commands.")
             return
 
         data = query.data
-        message_text = ""
-        keyboard = []
-        commands = {
-            'admin_broadcast': {
-                'title': "📢 Broadcasting Commands",
-                'description': "Manage sending messages and choosing optimal times.",
-                'cmds': [
-                    "/broadcast - Start broadcasting",
-                    "/schedule - Schedule a broadcast",
-                    "/scheduled - View scheduled broadcasts",
-                    "/bestschedule - View optimal broadcast times",
-                ]
-            },
-            'admin_approvals': {
-                'title': "✅ Approval System Commands",
-                'description': "Review and approve pending content.",
-                'cmds': [
-                    "/approvals - View pending approvals",
-                    "/signals - View signal suggestions",
-                ]
-            },
-            'admin_duties': {
-                'title': "📋 Team Duties & QA",
-                'description': "Manage daily admin tasks and monitor team performance.",
-                'cmds': [
-                    "/myduty - View your assigned task",
-                    "/dutycomplete - Mark your task as complete",
-                    "/dutystats - View team completion stats (Super Admins only)",
-                ]
-            },
-            'admin_content': {
-                'title': "📚 Content & Education Management",
-                'description': "Manage the educational content database.",
-                'cmds': [
-                    "/synceducation - Manually sync content from channel (Super Admin only)",
-                    "/previeweducation - Preview a random piece of content",
-                ]
-            },
-            'admin_templates': {
-                'title': "📝 Template Management",
-                'description': "Create and manage message templates.",
-                'cmds': [
-                    "/templates - Manage templates",
-                    "/savetemplate - Save current as template",
-                ]
-            },
-            'admin_users': {
-                'title': "👥 User Management Commands",
-                'description': "Manage your bot's subscribers.",
-                'cmds': [
-                    "/add &lt;user_id&gt; - Add subscriber",
-                    "/stats - View statistics",
-                    "/subscribers - List subscribers",
-                ]
-            },
-            'admin_admins': {
-                'title': "👨‍💼 Admin Management Commands",
-                'description': "Manage other administrators.",
-                'cmds': [
-                    "/addadmin - Add new admin",
-                    "/removeadmin - Remove admin",
-                    "/admins - List all admins",
-                ]
-            },
-            'admin_monitoring': {
-                'title': "📊 Monitoring & Analytics",
-                'description': "Access logs and detailed performance metrics.",
-                'cmds': [
-                    "/logs - View activity logs (Super Admin only)",
-                    "/mystats - Your individual performance statistics",
-                ]
-            },
-            'admin_help': {
-                'title': "❓ Admin Help",
-                'description': "General information and assistance for admins.",
-                'cmds': [
-                    "Need specific help? Contact Executives.",
-                ]
-            }
-        }
-
-        if data in commands:
-            category_info = commands[data]
-            message_text = (
-                f"<b>{category_info['title']}</b>\n\n"
-                f"{category_info['description']}\n\n"
-                f"<b>Commands:</b>\n"
-                + "\n".join(category_info['cmds'])
-            )
-            keyboard.append([InlineKeyboardButton("⬅️ Back to Admin Main", callback_data='admin_main_menu')])
+        if data in ADMIN_CATEGORY_HTML:
+            message_text = ADMIN_CATEGORY_HTML[data]
+            reply_markup = ADMIN_BACK_MARKUP
         elif data == 'admin_main_menu':
-            role = self.get_admin_role(user_id)
-            message_text = (
-                f"🔧 <b>Admin Panel</b> ({role.value.replace('_', ' ').title()})\n\n"
-                "Welcome to the Admin Control Center. Select a category to manage."
-            )
-            keyboard = [
-                [InlineKeyboardButton("📢 Broadcasting", callback_data='admin_broadcast')],
-            ]
-            if self.has_permission(user_id, Permission.APPROVE_BROADCASTS):
-                keyboard.append([InlineKeyboardButton("✅ Approval System", callback_data='admin_approvals')])
-            
-            keyboard.append([InlineKeyboardButton("📝 Templates", callback_data='admin_templates')])
-            keyboard.append([InlineKeyboardButton("📋 Team Duties & QA", callback_data='admin_duties')])
-                
-            if user_id in self.super_admin_ids: 
-                 keyboard.append([InlineKeyboardButton("📚 Content & Education", callback_data='admin_content')])
-            keyboard.append([InlineKeyboardButton("👥 User Management", callback_data='admin_users')])
-            
-            if self.has_permission(user_id, Permission.MANAGE_ADMINS):
-                keyboard.append([InlineKeyboardButton("👨‍💼 Admin Management", callback_data='admin_admins')])
-            
-            if self.has_permission(user_id, Permission.VIEW_LOGS):
-                keyboard.append([InlineKeyboardButton("📊 Monitoring", callback_data='admin_monitoring')])
-            
-            keyboard.append([InlineKeyboardButton("❓ Help", callback_data='admin_help')])
+            message_text, reply_markup = self._admin_main_menu(admin_ctx)
         else:
             message_text = "Unknown admin command."
-            keyboard.append([InlineKeyboardButton("⬅️ Back to Admin Main", callback_data='admin_main_menu')])
+            reply_markup = ADMIN_BACK_MARKUP
 
-        reply_markup = InlineKeyboardMarkup(keyboard)
         await query.edit_message_text(message_text, reply_markup=reply_markup, parse_mode=ParseMode.HTML)
 
     async def help_command_v2(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Interactive help menu"""
         
-        self.engagement_tracker.update_engagement(update.effective_user.id, 'command_used')
-        
-        keyboard = [
-            [InlineKeyboardButton("📊 Trading Tools", callback_data="help_tools")],
-            [InlineKeyboardButton("💎 VIP & Signals", callback_data="help_vip")],
-            [InlineKeyboardButton("🏆 Community", callback_data="help_community")],
-            [InlineKeyboardButton("⚙️ My Account", callback_data="help_account")]
-        ]
-        
-        message = (
-            "❓ <b>PipSage Help</b>\n\n"
-            "What would you like to know about?"
-        )
+        self.engagement_tracker.queue_engagement(update.effective_user.id, 'command_used')
         
         await update.message.reply_text(
-            message,
+            HELP_TEXTS['help_main'],
             parse_mode=ParseMode.HTML,
-            reply_markup=InlineKeyboardMarkup(keyboard)
+            reply_markup=HELP_MAIN_MARKUP
         )
 
     async def handle_help_callbacks(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -3620,56 +4436,14 @@ class BroadcastBot:
         query = update.callback_query
         await query.answer()
         
-        help_texts = {
-            'help_tools': (
-                "🛠 <b>Trading Tools</b>\n\n"
-                "/pips - Calculate pip profit/loss\n"
-                "/positionsize - Calculate lot size for risk\n"
-                "/news - Latest forex news\n"
-                "/calendar - Economic events\n\n"
-                "💡 All tools work instantly!"
-            ),
-            'help_vip': (
-                "💎 <b>VIP & Signals</b>\n\n"
-                "/subscribe - Join VIP for premium signals\n"
-                "/suggestsignal - Suggest a signal\n"
-                "/performance - View our public stats\n"
-                "/testimonials - See what members say\n\n"
-                "Join: /subscribe"
-            ),
-            'help_community': (
-                "🏆 <b>Community Features</b>\n\n"
-                "/referral - Refer friends, earn rewards\n"
-                "/mystats - View your signal stats\n"
-                "/myprogress - Track your signal progress\n"
-            ),
-            'help_account': (
-                "⚙️ <b>My Account</b>\n\n"
-                "/settings - Manage notifications\n"
-                "/start - View your main menu\n"
-            ),
-            'help_main': (
-                "❓ <b>PipSage Help</b>\n\n"
-                "What would you like to know about?"
-            )
-        }
-        
-        text = help_texts.get(query.data, "Coming soon!")
+        text = HELP_TEXTS.get(query.data, "Coming soon!")
         
-        if query.data == "help_main":
-            keyboard = [
-                [InlineKeyboardButton("📊 Trading Tools", callback_data="help_tools")],
-                [InlineKeyboardButton("💎 VIP & Signals", callback_data="help_vip")],
-                [InlineKeyboardButton("🏆 Community", callback_data="help_community")],
-                [InlineKeyboardButton("⚙️ My Account", callback_data="help_account")]
-            ]
-        else:
-            keyboard = [[InlineKeyboardButton("🔙 Back to Help", callback_data="help_main")]]
+        reply_markup = HELP_MAIN_MARKUP if query.data == "help_main" else HELP_BACK_MARKUP
         
         await query.edit_message_text(
             text,
             parse_mode=ParseMode.HTML,
-            reply_markup=InlineKeyboardMarkup(keyboard)
+            reply_markup=reply_markup
         )
 
 
@@ -3679,7 +4453,7 @@ class BroadcastBot:
         await query.answer()
         
         data = query.data
-        action, template_id = data.split('_', 2)[1:] 
+        action, _, template_id = data.partition('_')[2].partition('_')
         
         template = self.db.get_template(template_id)
         
@@ -3781,7 +4555,7 @@ class BroadcastBot:
             await update.message.reply_text("❌ You don't have permission to use this command.")
             return
 
-        stats = self.db.get_stats()
+        stats = await asyncio.to_thread(self.db.get_stats)
         stats_text = (
             f"📊 Bot Statistics\n\n"
             f"👥 Total Users: {stats.get('total_users', 0)}\n"
@@ -3802,22 +4576,40 @@ class BroadcastBot:
             await update.message.reply_text("❌ You don't have permission to use this command.")
             return
 
-        subscribers = self.db.get_all_subscribers()
+        subscribers = await asyncio.to_thread(self.db.get_all_subscribers)
 
         if not subscribers:
             await update.message.reply_text("📝 No subscribers yet.")
             return
 
-        subscribers_list = "\n".join([f"• {sub_id}" for sub_id in sorted(subscribers)])
-        message = f"📝 Subscribers List ({len(subscribers)} total):\n\n{subscribers_list}"
+        header = f"📝 Subscribers List ({len(subscribers)} total):"
+        chunks = self._iter_text_chunks(f"• {sub_id}" for sub_id in sorted(subscribers))
+        first_chunk = next(chunks)
+        second_chunk = next(chunks, None)
 
-        if len(message) > 4000:
-            chunks = [subscribers_list[i:i+3500] for i in range(0, len(subscribers_list), 3500)]
-            await update.message.reply_text(f"📝 Subscribers List ({len(subscribers)} total):")
-            for chunk in chunks:
-                await update.message.reply_text(chunk)
-        else:
-            await update.message.reply_text(message)
+        if second_chunk is None:
+            await update.message.reply_text(f"{header}\n\n{first_chunk}")
+            return
+
+        await update.message.reply_text(header)
+        await update.message.reply_text(first_chunk)
+        for chunk in itertools.chain([second_chunk], chunks):
+            await update.message.reply_text(chunk)
+
+    @staticmethod
+    def _iter_text_chunks(lines, limit: int = 3500):
+        """Group lines into newline-joined chunks of at most `limit` characters"""
+        buf = []
+        size = 0
+        for line in lines:
+            if buf and size + len(line) + 1 > limit:
+                yield "\n".join(buf)
+                buf = []
+                size = 0
+            buf.append(line)
+            size += len(line) + 1
+        if buf:
+            yield "\n".join(buf)
 
 
     async def suggest_signal_start_v2(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -3825,18 +4617,19 @@ class BroadcastBot:
         user = update.effective_user
         user_id = user.id
         
-        self.engagement_tracker.update_engagement(user_id, 'command_used')
+        self.engagement_tracker.queue_engagement(user_id, 'command_used')
 
         if not await self.is_user_subscribed(user_id, context):
             await self.send_join_channel_message(user_id, context)
             return ConversationHandler.END
 
-        limit, level = self.get_user_suggestion_limit(user_id)
-        today_count = self.db.get_user_suggestions_today(user_id)
+        suggestion_ctx = self.db.get_user_suggestion_context(user_id)
+        limit, level = self.get_user_suggestion_limit(user_id, suggestion_ctx['user'])
+        today_count = suggestion_ctx['today_count']
         remaining = limit - today_count
 
         if remaining <= 0:
-            avg_rating = self.db.get_user_average_rating(user_id)
+            avg_rating = self._user_avg_rating(user_id, suggestion_ctx['user'])
             message = (
                 f"❌ Daily limit reached ({today_count}/{limit})\n\n"
                 f"📊 Your Stats:\n"
@@ -3910,10 +4703,32 @@ class BroadcastBot:
     
         await query.edit_message_text(example, parse_mode=ParseMode.HTML)
 
+    async def process_achievement_checks(self, context: ContextTypes.DEFAULT_TYPE):
+        """Drain queued achievement checks; repeat events for one user collapse into a single check"""
+        if not self._pending_achievement_checks:
+            return
+        user_ids = self._pending_achievement_checks
+        self._pending_achievement_checks = set()
+        try:
+            await self.achievement_system.check_and_award_achievements_batch(user_ids, context, self.db)
+        except Exception as e:
+            logger.error(f"Error processing achievement checks, requeueing {len(user_ids)} user(s): {e}")
+            self._pending_achievement_checks |= user_ids
+
+    async def _post_submit_hooks(self, user_id: int, suggestion_id: str, context: ContextTypes.DEFAULT_TYPE):
+        """Engagement, achievements and admin notification after a signal is submitted"""
+        try:
+            self.engagement_tracker.update_engagement(user_id, 'signal_suggested')
+            self._pending_achievement_checks.add(user_id)
+            await self.notify_super_admins_new_suggestion(context, suggestion_id)
+        except Exception as e:
+            logger.exception(f"Error in post-submit hooks for suggestion {suggestion_id}: {e}")
+
     async def handle_force_submit(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle forced submission after warning"""
         query = update.callback_query
         await query.answer()
+        user = query.from_user
     
         if query.data == "force_submit_text":
             text = context.user_data.get('pending_signal_text')
@@ -3925,18 +4740,16 @@ class BroadcastBot:
             
                 suggestion_id = self.db.create_signal_suggestion(
                     message_data,
-                    query.from_user.id,
-                    query.from_user.first_name or query.from_user.username or str(query.from_user.id)
+                    user.id,
+                    user.first_name or user.username or str(user.id)
                 )
             
                 if suggestion_id:
-                    self.engagement_tracker.update_engagement(query.from_user.id, 'signal_suggested')
-                    await self.achievement_system.check_and_award_achievements(query.from_user.id, context, self.db)
                     await query.edit_message_text(
                         "✅ Signal submitted!\n\n"
                         "⚠️ Note: Low-quality signals may receive lower ratings."
                     )
-                    await self.notify_super_admins_new_suggestion(context, suggestion_id)
+                    self._spawn(self._post_submit_hooks(user.id, suggestion_id, context))
                 else:
                     await query.edit_message_text("❌ Failed to submit.")
             return ConversationHandler.END
@@ -3955,18 +4768,16 @@ class BroadcastBot:
             
                 suggestion_id = self.db.create_signal_suggestion(
                     message_data,
-                    query.from_user.id,
-                    query.from_user.first_name or query.from_user.username or str(query.from_user.id)
+                    user.id,
+                    user.first_name or user.username or str(user.id)
                 )
             
                 if suggestion_id:
-                    self.engagement_tracker.update_engagement(query.from_user.id, 'signal_suggested')
-                    await self.achievement_system.check_and_award_achievements(query.from_user.id, context, self.db)
                     await query.edit_message_text(
                         "✅ Signal submitted!\n\n"
                         "⚠️ Note: Low-quality images may receive lower ratings."
                     )
-                    await self.notify_super_admins_new_suggestion(context, suggestion_id)
+                    self._spawn(self._post_submit_hooks(user.id, suggestion_id, context))
                 else:
                     await query.edit_message_text("❌ Failed to submit.")
             return ConversationHandler.END
@@ -3977,25 +4788,16 @@ class BroadcastBot:
             
     def validate_signal_format(self, text: str) -> (bool, str):
         """Check if signal meets minimum quality standards"""
-        required_elements = ['pair', 'entry']
-        text_lower = text.lower()
-    
-        missing = []
-        for element in required_elements:
-            if f"{element}:" not in text_lower and element not in text_lower:
-                missing.append(element.upper())
-    
-        if missing:
+        if not SIGNAL_REQUIRED_RE.match(text):
+            text_lower = text.lower()
+            missing = [element.upper() for element in SIGNAL_REQUIRED_FIELDS if element not in text_lower]
             return False, f"Missing required fields: {', '.join(missing)}. Please include at least Pair and Entry."
     
-        pairs = ['EUR', 'USD', 'GBP', 'JPY', 'AUD', 'NZD', 'CAD', 'CHF', 
-                 'XAU', 'GOLD', 'SILVER', 'XAG', 'OIL', 'CRUDE',
-                 'V25', 'V75', 'V100', 'BOOM', 'CRASH', 
-                 'US30', 'NAS100', 'SPX500'] 
-        has_pair = any(pair in text.upper() for pair in pairs)
+        text_upper = text.upper()
+        has_pair = SIGNAL_PAIR_TOKENS_RE.search(text_upper) is not None
     
         if not has_pair:
-            if not re.search(r'[A-Z]{3}[/\s]?[A-Z]{3}', text.upper()):
+            if not SIGNAL_PAIR_RE.search(text_upper):
                 return False, "Could not identify trading pair. Use format like 'EUR/USD', 'EURUSD' or 'GOLD'."
     
         if len(text.strip()) < 20:
@@ -4037,11 +4839,8 @@ class BroadcastBot:
     
         try:
             photo_bytes = await (await photo_file.get_file()).download_as_bytearray()
-            image = Image.open(io.BytesIO(photo_bytes))
-        
-            image = image.convert('L')
-        
-            extracted_text = pytesseract.image_to_string(image)
+            async with self._ocr_semaphore:
+                extracted_text = await asyncio.to_thread(ImageTextExtractor.extract_text, bytes(photo_bytes))
         
             if not extracted_text or len(extracted_text.strip()) < 5:
                 return False, "Image is unclear. Could not read any text from it.", ""
@@ -4156,15 +4955,12 @@ class BroadcastBot:
         )
 
         if suggestion_id:
-            self.engagement_tracker.update_engagement(user.id, 'signal_suggested')
-            await self.achievement_system.check_and_award_achievements(user.id, context, self.db)
             await update.message.reply_text(
                 "✅ Signal suggestion submitted!\n\n"
                 "Super Admins will review your suggestion.\n"
                 "You'll be notified when it's reviewed."
             )
-
-            await self.notify_super_admins_new_suggestion(context, suggestion_id)
+            self._spawn(self._post_submit_hooks(user.id, suggestion_id, context))
         else:
             await update.message.reply_text("❌ Failed to submit suggestion. Please try again.")
 
@@ -4208,60 +5004,61 @@ class BroadcastBot:
         for suggestion in suggestions:
             await self.show_signal_suggestion(update, context, suggestion)
 
+    def _build_sender(self, bot, payload: BroadcastPayload, body: str,
+                      disable_web_page_preview: bool = None, **kwargs):
+        """
+        Bind the Bot method for a payload's type and every argument except chat_id,
+        so a fan-out resolves the media dispatch once instead of per recipient.
+        body is the full text for text messages and the caption for media.
+        """
+        if payload.type == 'text':
+            return partial(
+                bot.send_message,
+                text=body,
+                disable_web_page_preview=disable_web_page_preview,
+                **kwargs
+            )
+        method, media_field = self._MEDIA_SENDERS[payload.type]
+        return partial(getattr(bot, method), caption=body, **{media_field: payload.file_id}, **kwargs)
+
+    async def _send_content(self, bot, chat_id: int, payload: BroadcastPayload, body: str,
+                            disable_web_page_preview: bool = None, **kwargs):
+        """Send a payload to one chat; see _build_sender for the arguments"""
+        return await self._build_sender(bot, payload, body, disable_web_page_preview, **kwargs)(chat_id)
+
+    @staticmethod
+    def _review_markup(prefix: str, item_id: str) -> InlineKeyboardMarkup:
+        """Approve/reject keyboard for a pending signal ('sig') or broadcast ('app')"""
+        return InlineKeyboardMarkup([[
+            InlineKeyboardButton("✅ Approve", callback_data=f"{prefix}_approve_{item_id}"),
+            InlineKeyboardButton("❌ Reject", callback_data=f"{prefix}_reject_{item_id}")
+        ]])
+
     async def show_signal_suggestion(self, update: Update, context: ContextTypes.DEFAULT_TYPE, suggestion: Dict):
         """Show a signal suggestion for review"""
         suggestion_id = str(suggestion['_id'])
         short_id = suggestion_id[-8:]
         suggester = suggestion['suggester_name']
-        created_at = datetime.fromtimestamp(suggestion['created_at']).strftime('%Y-%m-%d %H:%M')
+        created_at = format_minute(int(suggestion['created_at']) // 60)
 
         message_data = suggestion['message_data']
 
-        keyboard = [
-            [
-                InlineKeyboardButton("✅ Approve", callback_data=f"sig_approve_{suggestion_id}"),
-                InlineKeyboardButton("❌ Reject", callback_data=f"sig_reject_{suggestion_id}")
-            ]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
+        reply_markup = self._review_markup('sig', suggestion_id)
 
         header = (
             f"💡 Signal Suggestion\n"
             f"ID: {short_id}\n"
             f"From: {suggester}\n"
             f"Submitted: {created_at}\n"
-            f"{'─' * 30}\n\n"
+            f"{SEPARATOR}\n\n"
         )
+        payload = BroadcastPayload.from_message_data(message_data)
+        body = f"{header}{payload.text}"
 
         try:
-            if message_data['type'] == 'text':
-                full_message = header + message_data['content']
-                await context.bot.send_message(
-                    chat_id=update.effective_chat.id,
-                    text=full_message,
-                    reply_markup=reply_markup
-                )
-            elif message_data['type'] == 'photo':
-                await context.bot.send_photo(
-                    chat_id=update.effective_chat.id,
-                    photo=message_data['file_id'],
-                    caption=header + (message_data.get('caption') or ''),
-                    reply_markup=reply_markup
-                )
-            elif message_data['type'] == 'video':
-                await context.bot.send_video(
-                    chat_id=update.effective_chat.id,
-                    video=message_data['file_id'],
-                    caption=header + (message_data.get('caption') or ''),
-                    reply_markup=reply_markup
-                )
-            elif message_data['type'] == 'document':
-                await context.bot.send_document(
-                    chat_id=update.effective_chat.id,
-                    document=message_data['file_id'],
-                    caption=header + (message_data.get('caption') or ''),
-                    reply_markup=reply_markup
-                )
+            await self._send_content(
+                context.bot, update.effective_chat.id, payload, body, reply_markup=reply_markup
+            )
         except Exception as e:
             logger.error(f"Error showing signal suggestion: {e}")
 
@@ -4278,7 +5075,7 @@ class BroadcastBot:
                 await query.edit_message_caption(caption=error_text)
             return ConversationHandler.END
 
-        action, suggestion_id = query.data.split('_', 2)[1:]
+        action, _, suggestion_id = query.data.partition('_')[2].partition('_')
 
         suggestion = self.db.get_suggestion_by_id(suggestion_id)
         if not suggestion:
@@ -4291,18 +5088,8 @@ class BroadcastBot:
 
         if action == "approve":
             context.user_data['suggestion_to_rate'] = suggestion_id
-            keyboard = [
-                [
-                    InlineKeyboardButton("⭐", callback_data="sig_rate_1"),
-                    InlineKeyboardButton("⭐⭐", callback_data="sig_rate_2"),
-                    InlineKeyboardButton("⭐⭐⭐", callback_data="sig_rate_3"),
-                    InlineKeyboardButton("⭐⭐⭐⭐", callback_data="sig_rate_4"),
-                    InlineKeyboardButton("⭐⭐⭐⭐⭐", callback_data="sig_rate_5"),
-                ]
-            ]
-            # ...
-            reply_markup = InlineKeyboardMarkup(keyboard)
-            
+            reply_markup = self._SIGNAL_RATING_MARKUP
+
             new_prompt = "Please rate this signal (1-5 stars) before approving:"
             
             if query.message.text:
@@ -4357,23 +5144,22 @@ class BroadcastBot:
         if not suggestion_id:
             return ConversationHandler.END
 
-        suggestion = self.db.get_suggestion_by_id(suggestion_id)
+        suggestion = await asyncio.to_thread(self.db.approve_suggestion, suggestion_id, query.from_user.id, rating)
         if not suggestion:
             return ConversationHandler.END
 
-        self.db.update_suggestion_status(suggestion_id, 'approved', query.from_user.id, rating=rating)
         self.admin_duty_manager.credit_duty_for_action(query.from_user.id, 'signal_approved')
         suggester_id = suggestion['suggested_by']
-        self.engagement_tracker.update_engagement(suggester_id, 'signal_approved')
-        if rating == 5:
-            self.engagement_tracker.update_engagement(suggester_id, 'signal_5_star')
-        await self.achievement_system.check_and_award_achievements(suggester_id, context, self.db)
+        self.engagement_tracker.update_engagement_many(
+            suggester_id, {'signal_approved': 1, 'signal_5_star': 1} if rating == 5 else {'signal_approved': 1}
+        )
+        self._pending_achievement_checks.add(suggester_id)
 
         await self.broadcast_signal(context, suggestion)
 
         try:
-            all_users = self.db.get_all_users()
-            push_target_ids = [uid for uid in all_users if self.notification_manager.should_notify(uid, 'signals')]
+            all_users = await asyncio.to_thread(self.db.get_all_users)
+            push_target_ids = list(await asyncio.to_thread(self.notification_manager.get_eligible_users, all_users, 'signals'))
             
             msg_data = suggestion['message_data']
             preview = "Check the app for details."
@@ -4382,7 +5168,7 @@ class BroadcastBot:
             elif msg_data.get('caption'):
                 preview = msg_data['caption'][:50] + "..."
                 
-            asyncio.create_task(self.send_push_to_users(
+            self._spawn(self.send_push_to_users(
                 push_target_ids,
                 "New Signal Approved! 🚀",
                 f"Rating: {rating}⭐\n{preview}",
@@ -4424,7 +5210,7 @@ class BroadcastBot:
         )
         self.admin_duty_manager.credit_duty_for_action(update.effective_user.id, 'signal_rejected')
         try:
-            asyncio.create_task(self.send_push_to_users(
+            self._spawn(self.send_push_to_users(
                 [suggestion['suggested_by']],
                 "Signal Suggestion Update",
                 f"Your signal was not approved. Reason: {reason}",
@@ -4475,7 +5261,7 @@ class BroadcastBot:
         )
         self.admin_duty_manager.credit_duty_for_action(update.effective_user.id, 'signal_rejected')
         try:
-            asyncio.create_task(self.send_push_to_users(
+            self._spawn(self.send_push_to_users(
                 [suggestion['suggested_by']],
                 "Signal Suggestion Update",
                 f"Your signal was not approved. Reason: {reason}",
@@ -4499,25 +5285,71 @@ class BroadcastBot:
         Check if the error indicates the bot was blocked or the user is invalid.
         If so, remove them from the database immediately.
         """
+        if isinstance(error, (RetryAfter, TimedOut)):
+            return False
+
         err_str = str(error).lower()
-        block_indicators = [
-            "bot was blocked",
-            "user is deactivated",
-            "chat not found",
-            "forbidden"
-        ]
-        
-        if any(indicator in err_str for indicator in block_indicators):
-            self.db.delete_blocked_user(user_id)
+        if any(indicator in err_str for indicator in self._BLOCK_INDICATORS):
+            await asyncio.to_thread(self.db.delete_blocked_user, user_id)
             return True
         return False
 
+    async def _fan_out(self, user_ids, send_one, label: str) -> Tuple[int, int]:
+        """
+        Run send_one(user_id) for every user with bounded concurrency.
+        Pacing is left to the application's rate limiter. Returns (success, failed).
+        A timed-out send is retried once; a flood error that outlives the rate limiter's
+        own retries gets one more attempt after its retry_after, holding only that worker.
+        user_ids may be a DB cursor: a producer pages it in a worker thread into a bounded
+        queue, so sending starts with the first batch and overlaps the rest of the scan.
+        """
+        user_iter = iter(user_ids)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=FAN_OUT_QUEUE_SIZE)
+        counts = {'success': 0, 'failed': 0}
+
+        async def producer():
+            try:
+                while True:
+                    batch = await asyncio.to_thread(list, itertools.islice(user_iter, FAN_OUT_FETCH_BATCH))
+                    if not batch:
+                        break
+                    for user_id in batch:
+                        await queue.put(user_id)
+            except Exception as e:
+                logger.error(f"Error reading recipients for {label}: {e}")
+            finally:
+                for _ in range(BROADCAST_CONCURRENCY):
+                    await queue.put(None)
+
+        async def send_with_retry(user_id: int):
+            try:
+                await send_one(user_id)
+            except RetryAfter as e:
+                retry_after = e.retry_after
+                if isinstance(retry_after, timedelta):
+                    retry_after = retry_after.total_seconds()
+                await asyncio.sleep(retry_after)
+                await send_one(user_id)
+            except TimedOut:
+                await send_one(user_id)
+
+        async def worker():
+            while (user_id := await queue.get()) is not None:
+                try:
+                    await send_with_retry(user_id)
+                    counts['success'] += 1
+                except Exception as e:
+                    counts['failed'] += 1
+                    if not await self.check_and_handle_block(user_id, e):
+                        logger.error(f"Failed to send {label} to {user_id}: {e}")
+
+        await asyncio.gather(producer(), *(worker() for _ in range(BROADCAST_CONCURRENCY)))
+        return counts['success'], counts['failed']
+
     async def broadcast_signal(self, context: ContextTypes.DEFAULT_TYPE, suggestion: Dict):
         """Broadcast approved signal to all users (Optimized for Performance)"""
-        all_users = self.db.get_all_users()
-        
-        target_users = self.notification_manager.get_eligible_users(all_users, 'signals')
-        
+        target_users = self.notification_manager.iter_eligible_users('signals')
+
         message_data = suggestion['message_data']
         suggester = suggestion['suggester_name']
         rating = suggestion.get('rating')
@@ -4527,62 +5359,27 @@ class BroadcastBot:
             attribution += f"\n⭐ Admin Rating: {'⭐' * rating}"
 
         attribution += "\n\n🔕 Disable: /settings then toggle off Signal Suggestions"
+        payload = BroadcastPayload.from_message_data(message_data)
+        body = payload.text + attribution
 
-        success_count = 0
-        failed_count = 0
-
-        for user_id in target_users:
-            try:
-                if message_data['type'] == 'text':
-                    full_text = message_data['content'] + attribution
-                    await context.bot.send_message(
-                        chat_id=user_id,
-                        text=full_text,
-                        parse_mode=ParseMode.HTML,
-                        disable_web_page_preview=True
-                    )
-                elif message_data['type'] == 'photo':
-                    caption = (message_data.get('caption') or '') + attribution
-                    await context.bot.send_photo(
-                        chat_id=user_id,
-                        photo=message_data['file_id'],
-                        caption=caption,
-                        parse_mode=ParseMode.HTML
-                    )
-                elif message_data['type'] == 'video':
-                    caption = (message_data.get('caption') or '') + attribution
-                    await context.bot.send_video(
-                        chat_id=user_id,
-                        video=message_data['file_id'],
-                        caption=caption,
-                        parse_mode=ParseMode.HTML
-                    )
-                elif message_data['type'] == 'document':
-                    caption = (message_data.get('caption') or '') + attribution
-                    await context.bot.send_document(
-                        chat_id=user_id,
-                        document=message_data['file_id'],
-                        caption=caption,
-                        parse_mode=ParseMode.HTML
-                    )
-
-                success_count += 1
-                
-                await asyncio.sleep(0.05) 
-                
-            except Exception as e:
-                # Check for blocking/deactivation and remove user
-                if await self.check_and_handle_block(user_id, e):
-                    failed_count += 1
-                    continue
+        send_signal = self._build_sender(
+            context.bot, payload, body,
+            disable_web_page_preview=True, parse_mode=ParseMode.HTML
+        )
 
-                if "chat not found" not in str(e).lower() and "bot was blocked" not in str(e).lower():
-                    logger.error(f"Failed to send signal to {user_id}: {e}")
-                failed_count += 1
+        success_count, failed_count = await self._fan_out(target_users, send_signal, 'signal')
 
         logger.info(f"Signal broadcast completed: {success_count} success, {failed_count} failed")
         
-        tweet_url = await self.twitter.post_signal(context, suggestion)
+        self._spawn(self._share_signal_on_twitter(context, suggestion))
+
+    async def _share_signal_on_twitter(self, context: ContextTypes.DEFAULT_TYPE, suggestion: Dict):
+        """Tweet an approved signal and tell the suggester, off the approval path"""
+        try:
+            tweet_url = await self.twitter.post_signal(context, suggestion)
+        except Exception as e:
+            logger.error(f"Error sharing signal on Twitter: {e}")
+            return
         if tweet_url:
             try:
                 await context.bot.send_message(
@@ -4615,17 +5412,11 @@ class BroadcastBot:
         short_id = approval_id[-8:]
         creator = approval['creator_name']
         target = approval['target'].title()
-        created_at = datetime.fromtimestamp(approval['created_at']).strftime('%Y-%m-%d %H:%M')
+        created_at = format_minute(int(approval['created_at']) // 60)
 
         message_data = approval['message_data']
 
-        keyboard = [
-            [
-                InlineKeyboardButton("✅ Approve", callback_data=f"app_approve_{approval_id}"),
-                InlineKeyboardButton("❌ Reject", callback_data=f"app_reject_{approval_id}")
-            ]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
+        reply_markup = self._review_markup('app', approval_id)
 
         header = (
             f"📢 Broadcast Approval Request\n"
@@ -4633,38 +5424,15 @@ class BroadcastBot:
             f"Creator: {creator}\n"
             f"Target: {target}\n"
             f"Created: {created_at}\n"
-            f"{'─' * 30}\n\n"
+            f"{SEPARATOR}\n\n"
         )
+        payload = BroadcastPayload.from_message_data(message_data)
+        body = f"{header}{payload.text}"
 
         try:
-            if message_data['type'] == 'text':
-                full_message = header + message_data['content']
-                await context.bot.send_message(
-                    chat_id=update.effective_chat.id,
-                    text=full_message,
-                    reply_markup=reply_markup
-                )
-            elif message_data['type'] == 'photo':
-                await context.bot.send_photo(
-                    chat_id=update.effective_chat.id,
-                    photo=message_data['file_id'],
-                    caption=header + (message_data.get('caption') or ''),
-                    reply_markup=reply_markup
-                )
-            elif message_data['type'] == 'video':
-                await context.bot.send_video(
-                    chat_id=update.effective_chat.id,
-                    video=message_data['file_id'],
-                    caption=header + (message_data.get('caption') or ''),
-                    reply_markup=reply_markup
-                )
-            elif message_data['type'] == 'document':
-                await context.bot.send_document(
-                    chat_id=update.effective_chat.id,
-                    document=message_data['file_id'],
-                    caption=header + (message_data.get('caption') or ''),
-                    reply_markup=reply_markup
-                )
+            await self._send_content(
+                context.bot, update.effective_chat.id, payload, body, reply_markup=reply_markup
+            )
         except Exception as e:
             logger.error(f"Error showing approval request: {e}")
 
@@ -4672,12 +5440,13 @@ class BroadcastBot:
         """Handle broadcast approval/rejection"""
         query = update.callback_query
         await query.answer()
+        admin_id = query.from_user.id
 
-        if not self.has_permission(query.from_user.id, Permission.APPROVE_BROADCASTS):
+        if not self.has_permission(admin_id, Permission.APPROVE_BROADCASTS):
             await query.edit_message_text("❌ You don't have permission to approve broadcasts.")
             return
 
-        action, approval_id = query.data.split('_', 2)[1:]
+        action, _, approval_id = query.data.partition('_')[2].partition('_')
 
         approval = self.db.get_approval_by_id(approval_id)
         if not approval:
@@ -4685,10 +5454,10 @@ class BroadcastBot:
             return
 
         if action == "approve":
-            self.db.update_approval_status(approval_id, 'approved', query.from_user.id)
-            self.admin_duty_manager.credit_duty_for_action(query.from_user.id, 'broadcast_approved')
+            self.db.update_approval_status(approval_id, 'approved', admin_id)
+            self.admin_duty_manager.credit_duty_for_action(admin_id, 'broadcast_approved')
 
-            await self.execute_approved_broadcast(context, approval, query.from_user.id)
+            await self.execute_approved_broadcast(context, approval, admin_id)
 
             try:
                 await context.bot.send_message(
@@ -4702,8 +5471,8 @@ class BroadcastBot:
             await query.message.reply_text("✅ Broadcast approved and sent!")
 
         elif action == "reject":
-            self.db.update_approval_status(approval_id, 'rejected', query.from_user.id)
-            self.admin_duty_manager.credit_duty_for_action(query.from_user.id, 'broadcast_rejected')
+            self.db.update_approval_status(approval_id, 'rejected', admin_id)
+            self.admin_duty_manager.credit_duty_for_action(admin_id, 'broadcast_rejected')
 
             try:
                 await context.bot.send_message(
@@ -4716,37 +5485,42 @@ class BroadcastBot:
             await query.edit_message_reply_markup(reply_markup=None)
             await query.message.reply_text("❌ Broadcast rejected.")
 
+    async def _push_to_target(self, target: str, opted_out: frozenset, title: str, body: str, data: dict = None):
+        """Push to a broadcast target chunk by chunk from a streamed cursor, skipping opted-out users"""
+        user_ids = self.db.iter_user_ids_by_target(target)
+        while True:
+            chunk = await asyncio.to_thread(list, itertools.islice(user_ids, PUSH_TARGET_CHUNK))
+            if not chunk:
+                return
+            await self.send_push_to_users([uid for uid in chunk if uid not in opted_out], title, body, data=data)
+
     async def execute_approved_broadcast(self, context: ContextTypes.DEFAULT_TYPE,
                                         approval: Dict, approved_by: int):
         """Execute an approved broadcast"""
         message_data = approval['message_data']
         target = approval['target']
 
-        all_users = self.db.get_all_users()
-        subscribers = self.db.get_all_subscribers()
-        admin_ids = self.db.get_all_admin_ids()
-
-        if target == 'all':
-            target_users = all_users
-        elif target == 'subscribers':
-            target_users = subscribers
-        elif target == 'nonsubscribers':
-            target_users = all_users - subscribers
-        elif target == 'admins':
-            target_users = admin_ids
-        else:
-            target_users = all_users
+        opted_out = await asyncio.to_thread(self.notification_manager.get_opted_out_users, 'broadcasts')
+        skipped_count = 0
+
+        def recipients():
+            nonlocal skipped_count
+            for user_id in self.db.iter_user_ids_by_target(target):
+                if user_id in opted_out:
+                    skipped_count += 1
+                else:
+                    yield user_id
+
         try:
-            push_target_ids = [uid for uid in target_users if self.notification_manager.should_notify(uid, 'broadcasts')]
-            
             preview = "Tap to view."
             if message_data['type'] == 'text':
                 preview = message_data['content'][:60] + "..."
             elif message_data.get('caption'):
                 preview = message_data['caption'][:60] + "..."
                 
-            asyncio.create_task(self.send_push_to_users(
-                push_target_ids,
+            self._spawn(self._push_to_target(
+                target,
+                opted_out,
                 "New Announcement 📢",
                 preview,
                 data={'screen': 'Home'}
@@ -4754,71 +5528,29 @@ class BroadcastBot:
         except Exception as e:
             logger.error(f"Failed to initiate broadcast push: {e}")
 
-        success_count = 0
-        failed_count = 0
-                                            
-        footer = "\n\n🔕 Disable: /settings then toggle off Admin Signals & Announcements"
+        payload = BroadcastPayload.from_message_data(message_data)
+        body = payload.text + BROADCAST_FOOTER
 
-        for user_id in target_users:
-            if not self.notification_manager.should_notify(user_id, 'broadcasts'):
-                failed_count += 1
-                continue
-            try:
-                if message_data['type'] == 'text':
-                    text_to_send = message_data['content'] + footer
-                    await context.bot.send_message(
-                        chat_id=user_id,
-                        text=text_to_send,
-                        reply_markup=message_data.get('inline_buttons'),
-                        protect_content=message_data.get('protect_content', False)
-                    )
-                elif message_data['type'] == 'photo':
-                    caption_to_send = (message_data.get('caption') or '') + footer
-                    await context.bot.send_photo(
-                        chat_id=user_id,
-                        photo=message_data['file_id'],
-                        caption=caption_to_send,
-                        reply_markup=message_data.get('inline_buttons'),
-                        protect_content=message_data.get('protect_content', False)
-                    )
-                elif message_data['type'] == 'video':
-                    caption_to_send = (message_data.get('caption') or '') + footer
-                    await context.bot.send_video(
-                        chat_id=user_id,
-                        video=message_data['file_id'],
-                        caption=caption_to_send,
-                        reply_markup=message_data.get('inline_buttons'),
-                        protect_content=message_data.get('protect_content', False)
-                    )
-                elif message_data['type'] == 'document':
-                    caption_to_send = (message_data.get('caption') or '') + footer
-                    await context.bot.send_document(
-                        chat_id=user_id,
-                        document=message_data['file_id'],
-                        caption=caption_to_send,
-                        reply_markup=message_data.get('inline_buttons'),
-                        protect_content=message_data.get('protect_content', False)
-                    )
+        send_broadcast = self._build_sender(
+            context.bot, payload, body,
+            reply_markup=payload.inline_buttons,
+            protect_content=payload.protect_content
+        )
 
-                success_count += 1
-                await asyncio.sleep(0.05)
-            except Exception as e:
-                if await self.check_and_handle_block(user_id, e):
-                    failed_count += 1
-                    continue
-                    
-                logger.error(f"Failed to send approved broadcast to {user_id}: {e}")
-                failed_count += 1
+        target_count = await asyncio.to_thread(self.db.count_target_users, target)
+        success_count, failed_count = await self._fan_out(recipients(), send_broadcast, 'approved broadcast')
 
         self.db.log_activity(approved_by, 'approved_broadcast_sent', {
             'approval_id': str(approval['_id']),
             'creator': approval['created_by'],
             'target': target,
+            'target_count': target_count,
             'success': success_count,
-            'failed': failed_count
+            'failed': failed_count,
+            'skipped': skipped_count
         })
 
-        logger.info(f"Approved broadcast sent: {success_count} success, {failed_count} failed")
+        logger.info(f"Approved broadcast sent to {target} ({target_count} users): {success_count} success, {failed_count} failed, {skipped_count} opted out")
         
     async def start_broadcast(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Start broadcast conversation - NOW ASKS PLATFORM FIRST"""
@@ -4975,14 +5707,11 @@ class BroadcastBot:
             
     async def receive_buttons(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Receive and parse buttons"""
-        lines = update.message.text.strip().split('\n')
-        buttons = []
-        for line in lines:
-            parts = line.split('|', 1)
-            if len(parts) == 2:
-                text = parts[0].strip()
-                url = parts[1].strip()
-                buttons.append([InlineKeyboardButton(text, url=url)])
+        buttons = [
+            [InlineKeyboardButton(text.strip(), url=url.strip())]
+            for text, sep, url in (line.partition('|') for line in update.message.text.splitlines())
+            if sep and text.strip() and url.strip()
+        ]
 
         context.user_data['inline_buttons'] = InlineKeyboardMarkup(buttons)
         
@@ -5015,7 +5744,7 @@ class BroadcastBot:
         
     async def ask_target_audience(self, update, context: ContextTypes.DEFAULT_TYPE, scheduled=False):
         """Ask who to send the broadcast to"""
-        stats = self.db.get_stats()
+        stats = await asyncio.to_thread(self.db.get_stats)
 
         keyboard = [
             [InlineKeyboardButton("👥 All Users", callback_data="target_all")],
@@ -5145,7 +5874,8 @@ class BroadcastBot:
             
         if self.needs_approval(user_id):
             creator_name = (update.effective_user.first_name or update.effective_user.username or str(user_id))
-            approval_id = self.db.create_broadcast_approval(
+            approval_id = await asyncio.to_thread(
+                self.db.create_broadcast_approval,
                 message_data,
                 user_id,
                 creator_name,
@@ -5221,7 +5951,8 @@ class BroadcastBot:
                 return ConversationHandler.END
                 
             creator_name = query.from_user.first_name or query.from_user.username or str(user_id)
-            approval_id = self.db.create_broadcast_approval(
+            approval_id = await asyncio.to_thread(
+                self.db.create_broadcast_approval,
                 message_data,
                 user_id,
                 creator_name,
@@ -5286,8 +6017,7 @@ class BroadcastBot:
             f"Use /approvals to review pending broadcasts."
         )
         
-        admins = self.db.get_all_admins()
-        approvers = [a['user_id'] for a in admins if self.has_permission(a['user_id'], Permission.APPROVE_BROADCASTS)]
+        approvers = self.get_admins_with_permission(Permission.APPROVE_BROADCASTS)
 
         await self.send_admin_notification(
             text=notification,
@@ -5316,7 +6046,15 @@ class BroadcastBot:
     async def process_scheduled_broadcasts(self, context: ContextTypes.DEFAULT_TYPE):
         """Process scheduled broadcasts (runs periodically)"""
         try:
-            pending = self.db.get_pending_broadcasts()
+            pending = await asyncio.to_thread(self.db.get_pending_broadcasts)
+            if not pending:
+                return
+
+            if not await asyncio.to_thread(self.db.claim_scheduled_broadcasts, [b['_id'] for b in pending]):
+                return
+
+            opted_out = await asyncio.to_thread(self.notification_manager.get_opted_out_users, 'broadcasts')
+            status_updates = []
 
             for broadcast in pending:
                 try:
@@ -5324,68 +6062,34 @@ class BroadcastBot:
                     target = broadcast['target']
                     broadcast_id = str(broadcast['_id'])
 
-                    all_users = self.db.get_all_users()
-                    subscribers = self.db.get_all_subscribers()
-                    admin_ids = self.db.get_all_admin_ids()
-
-                    if target == 'all':
-                        target_users = all_users
-                    elif target == 'subscribers':
-                        target_users = subscribers
-                    elif target == 'nonsubscribers':
-                        target_users = all_users - subscribers
-                    elif target == 'admins':
-                        target_users = admin_ids
-                    else:
-                        target_users = all_users
-
-                    success_count = 0
-                    failed_count = 0
-                    footer = "\n\n🔕 Disable: /settings then toggle off Admin Signals & Announcements"
+                    payload = BroadcastPayload.from_message_data(message_data)
+                    body = payload.text + BROADCAST_FOOTER
 
-                    for user_id in target_users:
-                        if not self.notification_manager.should_notify(user_id, 'broadcasts'):
-                            failed_count += 1
-                            continue
-                        try:
-                            if message_data['type'] == 'text':
-                                text_to_send = message_data['content'] + footer
-                                await context.bot.send_message(
-                                    chat_id=user_id,
-                                    text=text_to_send,
-                                    reply_markup=message_data.get('inline_buttons'),
-                                    protect_content=message_data.get('protect_content', False)
-                                )
-                            elif message_data['type'] == 'photo':
-                                caption_to_send = (message_data.get('caption') or '') + footer
-                                await context.bot.send_photo(
-                                    chat_id=user_id,
-                                    photo=message_data['file_id'],
-                                    caption=caption_to_send,
-                                    reply_markup=message_data.get('inline_buttons'),
-                                    protect_content=message_data.get('protect_content', False)
-                                )
+                    send_scheduled = self._build_sender(
+                        context.bot, payload, body,
+                        reply_markup=payload.inline_buttons,
+                        protect_content=payload.protect_content
+                    )
 
-                            success_count += 1
-                            await asyncio.sleep(0.05)
-                        except Exception as e:
-                            if await self.check_and_handle_block(user_id, e):
-                                failed_count += 1
-                                continue
-                                
-                            logger.error(f"Failed to send scheduled to {user_id}: {e}")
-                            failed_count += 1
+                    recipients = (
+                        user_id for user_id in self.db.iter_user_ids_by_target(target)
+                        if user_id not in opted_out
+                    )
+                    success_count, failed_count = await self._fan_out(recipients, send_scheduled, 'scheduled broadcast')
 
                     if broadcast['repeat'] == 'once':
-                        self.db.update_broadcast_status(broadcast_id, 'completed')
+                        status_updates.append(UpdateOne(
+                            {'_id': broadcast['_id']},
+                            {'$set': {'status': 'completed', 'executed_at': time.time()}}
+                        ))
                     else:
                         next_time = self.calculate_next_time(broadcast['scheduled_time'], broadcast['repeat'])
-                        self.db.scheduled_broadcasts_collection.update_one(
+                        status_updates.append(UpdateOne(
                             {'_id': broadcast['_id']},
-                            {'$set': {'scheduled_time': next_time}}
-                        )
+                            {'$set': {'status': 'pending', 'scheduled_time': next_time}}
+                        ))
 
-                    self.db.log_activity(broadcast['created_by'], 'scheduled_broadcast_sent', {
+                    self.db.log_activity_buffered(broadcast['created_by'], 'scheduled_broadcast_sent', {
                         'broadcast_id': broadcast_id,
                         'success': success_count,
                         'failed': failed_count
@@ -5395,12 +6099,21 @@ class BroadcastBot:
 
                 except Exception as e:
                     logger.error(f"Error processing scheduled broadcast: {e}")
+                    status_updates.append(UpdateOne(
+                        {'_id': broadcast['_id']},
+                        {'$set': {'status': 'pending'}}
+                    ))
+
+            await asyncio.to_thread(self.db.bulk_update_scheduled_broadcasts, status_updates)
+            self.db.flush_activity()
 
         except Exception as e:
             logger.error(f"Error in process_scheduled_broadcasts: {e}")
 
-    async def broadcast_suggester_leaderboard_v2(self, context: ContextTypes.DEFAULT_TYPE, time_frame: str):
+    async def broadcast_suggester_leaderboard_v2(self, context: ContextTypes.DEFAULT_TYPE, time_frame: str, job_cache: Dict = None):
         """Professional, motivating leaderboard"""
+        if job_cache is None:
+            job_cache = {}
         stats = self.db.get_suggester_stats(time_frame)
 
         if not stats:
@@ -5414,25 +6127,22 @@ class BroadcastBot:
         )
         
         medals = ["🥇", "🥈", "🥉"]
+        top_stats = stats[:10]
+        privacy = self.db.get_leaderboard_privacy([stat['_id'] for stat in top_stats])
         
-        for i, stat in enumerate(stats[:10]):
+        for i, stat in enumerate(top_stats):
             if i < 3:
                 rank_icon = medals[i]
             else:
                 rank_icon = f"<b>#{i+1}</b>"
             
-            user_doc = self.db.users_collection.find_one({'user_id': stat['_id']})
-            is_public = user_doc.get('leaderboard_public', True) if user_doc else True
+            is_public = privacy.get(stat['_id'], True)
             name = stat['suggester_name'] if is_public else "Anonymous"
 
             rating = stat['average_rating']
             count = stat['signal_count']
             
-            tier = ""
-            if rating >= 4.5: tier = "⭐ Elite"
-            elif rating >= 4.0: tier = "💎 Expert"
-            elif rating >= 3.5: tier = "🔷 Advanced"
-            else: tier = "📊 Active"
+            tier = self._SUGGESTER_TIER_LABELS[bisect.bisect_right(self._SUGGESTER_TIER_THRESHOLDS, rating)]
             
             message += (
                 f"{rank_icon} <b>{name}</b> ({tier})\n"
@@ -5448,21 +6158,16 @@ class BroadcastBot:
         )
         message += "\n\n🔕 Disable: /settings then toggle off Leaderboards"
         
-        target_users = self.db.get_all_users()
-        for user_id in target_users:
-            if self.notification_manager.should_notify(user_id, 'leaderboards'):
-                try:
-                    await context.bot.send_message(
-                        chat_id=user_id, 
-                        text=message,
-                        parse_mode=ParseMode.HTML
-                    )
-                    await asyncio.sleep(0.05)
-                except Exception as e:
-                    if await self.check_and_handle_block(user_id, e):
-                        continue
-                    logger.error(f"Failed to send leaderboard to {user_id}: {e}")
-                    
+        if 'leaderboard_recipients' not in job_cache:
+            job_cache['leaderboard_recipients'] = await asyncio.to_thread(
+                self.notification_manager.get_eligible_users,
+                await asyncio.to_thread(self.db.get_all_users),
+                'leaderboards'
+            )
+        target_users = job_cache['leaderboard_recipients']
+        send_leaderboard = partial(context.bot.send_message, text=message, parse_mode=ParseMode.HTML)
+        await self._fan_out(target_users, send_leaderboard, 'leaderboard')
+
     async def _get_admin_performance_comment(self, score: int) -> str:
         """Generate a brutally honest comment on admin performance based ONLY on score"""
         if score == 0:
@@ -5479,9 +6184,14 @@ class BroadcastBot:
 
         return f"Comment: {activity_level}" 
 
-    async def broadcast_admin_leaderboard_v2(self, context: ContextTypes.DEFAULT_TYPE, time_frame: str):
+    async def broadcast_admin_leaderboard_v2(self, context: ContextTypes.DEFAULT_TYPE, time_frame: str, job_cache: Dict = None):
         """Professional admin performance board - private to admins"""
-        stats = self.db.get_admin_performance_stats(time_frame)
+        if job_cache is None:
+            job_cache = {}
+        stats_key = ('admin_stats', time_frame)
+        if stats_key not in job_cache:
+            job_cache[stats_key] = await asyncio.to_thread(self.db.get_admin_performance_stats, time_frame)
+        stats = job_cache[stats_key]
 
         if not stats:
             return
@@ -5500,12 +6210,7 @@ class BroadcastBot:
             approvals = stat.get('approvals', 0)
             rejections = stat.get('rejections', 0)
             
-            level = ""
-            if score >= 20: level = "🔥 Exceptional"
-            elif score >= 12: level = "⚡ High Impact"
-            elif score >= 6: level = "✅ Active"
-            elif score >= 3: level = "📊 Contributing"
-            else: level = "💤 Low Activity"
+            level = self._ADMIN_LEVEL_LABELS[bisect.bisect_right(self._ADMIN_LEVEL_THRESHOLDS, score)]
             
             message += (
                 f"<b>{i+1}. {name}</b> ({level})\n"
@@ -5526,30 +6231,23 @@ class BroadcastBot:
         
         message += "\n<i>Remember: Quality over quantity. Every interaction matters.</i>"
 
-        target_admins = self.db.get_all_admin_ids()
-        for admin_id in target_admins:
-            try:
-                await context.bot.send_message(
-                    chat_id=admin_id, 
-                    text=message,
-                    parse_mode=ParseMode.HTML
-                )
-                await asyncio.sleep(0.05)
-            except Exception as e:
-                logger.error(f"Failed to send admin leaderboard to {admin_id}: {e}")
+        target_admins = await asyncio.to_thread(self.db.get_all_admin_ids)
+        send_admin_leaderboard = partial(context.bot.send_message, text=message, parse_mode=ParseMode.HTML)
+        await self._fan_out(target_admins, send_admin_leaderboard, 'admin leaderboard')
 
     async def run_leaderboards_job_v2(self, context: ContextTypes.DEFAULT_TYPE):
         """Job to run weekly/monthly leaderboards"""
         logger.info("Running weekly leaderboard job...")
         today = datetime.now(timezone.utc)
+        job_cache = {}
 
-        await self.broadcast_suggester_leaderboard_v2(context, 'weekly')
+        await self.broadcast_suggester_leaderboard_v2(context, 'weekly', job_cache)
         
-        await self.broadcast_admin_leaderboard_v2(context, 'weekly')
+        await self.broadcast_admin_leaderboard_v2(context, 'weekly', job_cache)
 
         if today.day <= 7:
-            await self.broadcast_suggester_leaderboard_v2(context, 'monthly')
-            await self.broadcast_admin_leaderboard_v2(context, 'monthly')
+            await self.broadcast_suggester_leaderboard_v2(context, 'monthly', job_cache)
+            await self.broadcast_admin_leaderboard_v2(context, 'monthly', job_cache)
 
     def calculate_next_time(self, current_time: float, repeat: str) -> float:
         """Calculate next scheduled time based on repeat pattern"""
@@ -5658,10 +6356,11 @@ class BroadcastBot:
                 logger.warning("No duty assignments created")
                 return
             
-            for admin_id, duty_data in assignments.items():
-                await self.send_duty_notification(context, admin_id, duty_data)
-            
-            await self.send_duty_summary_to_super_admins(context, assignments)
+            await asyncio.gather(
+                *(self.send_duty_notification(context, admin_id, duty_data)
+                  for admin_id, duty_data in assignments.items()),
+                self.send_duty_summary_to_super_admins(context, assignments)
+            )
             
             logger.info(f"Daily duties assigned and notifications sent to {len(assignments)} admins")
             
@@ -5673,8 +6372,6 @@ class BroadcastBot:
         """Send duty assignment notification to admin"""
         duty_info = duty_data['duty_info']
         
-        tasks_text = "\n".join([f"  • {task}" for task in duty_info['tasks']])
-        
         priority_emoji = {
             'high': '🔴',
             'medium': '🟡',
@@ -5685,11 +6382,7 @@ class BroadcastBot:
             f"{duty_info['emoji']} <b>Your Duty for Today</b>\n"
             f"{priority_emoji} Priority: {duty_info['priority'].upper()}\n\n"
             
-            f"<b>{duty_info['name']}</b>\n\n"
-            
-            f"<b>Tasks:</b>\n{tasks_text}\n\n"
-            
-            f"<b>Target:</b> {duty_info['target']}\n\n"
+            + self._duty_html_block(duty_data['duty_category'], duty_info) +
             
             f"📝 When done, use: /dutycomplete [notes]\n"
             f"📋 View your duty: /myduty\n\n"
@@ -5706,32 +6399,53 @@ class BroadcastBot:
         except Exception as e:
             logger.error(f"Failed to send duty notification to {admin_id}: {e}")
     
-    async def send_duty_summary_to_super_admins(self, context: ContextTypes.DEFAULT_TYPE, 
-                                                assignments: Dict):
-        """Send duty summary to super admins"""
-        summary = (
+    def _get_duty_summary(self, assignments: Dict) -> str:
+        """Render the daily assignment summary, reusing today's copy when the assignments are unchanged"""
+        date_key = self.admin_duty_manager.get_date_key()
+        signature = tuple((admin_id, duty_data['duty_category']) for admin_id, duty_data in assignments.items())
+        cached = self._daily_summary_cache.get(date_key)
+        if cached and cached[0] == signature:
+            return cached[1]
+
+        labels = self.admin_duty_manager.CATEGORY_LABELS
+        parts = [
             "📋 <b>Daily Duty Assignments Summary</b>\n"
-            f"Date: {datetime.now(timezone.utc).strftime('%Y-%m-%d')}\n\n"
-        )
+            f"Date: {date_key}\n\n"
+        ]
         
-        for admin_id, duty_data in assignments.items():
-            summary += (
+        for duty_data in assignments.values():
+            parts.append(
                 f"• <b>{duty_data['admin_name']}</b> ({duty_data['admin_role']})\n"
-                f"  → {duty_data['duty_info']['emoji']} {duty_data['duty_category'].replace('_', ' ').title()}\n"
+                f"  → {duty_data['duty_info']['emoji']} {labels[duty_data['duty_category']]}\n"
             )
         
-        summary += "\n<i>Use /dutystats to view completion rates</i>"
-        
-        for super_admin_id in self.super_admin_ids:
-            try:
-                await context.bot.send_message(
-                    chat_id=super_admin_id,
-                    text=summary,
-                    parse_mode=ParseMode.HTML
-                )
-            except Exception as e:
-                logger.error(f"Failed to send duty summary to super admin {super_admin_id}: {e}")
+        parts.append("\n<i>Use /dutystats to view completion rates</i>")
+        summary = "".join(parts)
+
+        self._daily_summary_cache = {date_key: (signature, summary)}
+        return summary
+
+    async def send_duty_summary_to_super_admins(self, context: ContextTypes.DEFAULT_TYPE, 
+                                                assignments: Dict):
+        """Send duty summary to super admins"""
+        summary = self._get_duty_summary(assignments)
+        await asyncio.gather(*(
+            self._notify_admin(super_admin_id, summary) for super_admin_id in self.super_admin_ids
+        ))
     
+    def _duty_html_block(self, category: str, duty_info: Dict) -> str:
+        """Static name/tasks/target HTML for a duty category, rendered once per category"""
+        block = self._duty_html_cache.get(category)
+        if block is None:
+            tasks_text = "\n".join(f"  • {task}" for task in duty_info['tasks'])
+            block = (
+                f"<b>{duty_info['name']}</b>\n\n"
+                f"<b>Tasks:</b>\n{tasks_text}\n\n"
+                f"<b>Target:</b> {duty_info['target']}\n\n"
+            )
+            self._duty_html_cache[category] = block
+        return block
+
     async def my_duty_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Show admin's duty for today"""
         user_id = update.effective_user.id
@@ -5751,19 +6465,12 @@ class BroadcastBot:
             return
         
         duty_info = duty['duty_info']
-        tasks_text = "\n".join([f"  • {task}" for task in duty_info['tasks']])
-        
         status = "✅ COMPLETED" if duty.get('completed') else "⏳ PENDING"
         
         message = (
             f"{duty_info['emoji']} <b>Your Duty for Today</b>\n"
             f"Status: {status}\n\n"
-            
-            f"<b>{duty_info['name']}</b>\n\n"
-            
-            f"<b>Tasks:</b>\n{tasks_text}\n\n"
-            
-            f"<b>Target:</b> {duty_info['target']}\n\n"
+            + self._duty_html_block(duty['duty_category'], duty_info)
         )
         
         if duty.get('completed'):
@@ -5822,7 +6529,7 @@ class BroadcastBot:
         success = self.admin_duty_manager.mark_duty_complete(user_id, notes)
         
         if success:
-            self.engagement_tracker.update_engagement(user_id, 'duty_completed')
+            self.engagement_tracker.queue_engagement(user_id, 'duty_completed')
             await update.message.reply_text(
                 f"✅ <b>Duty Marked Complete!</b>\n\n"
                 f"{duty['duty_info']['name']}\n"
@@ -5830,20 +6537,14 @@ class BroadcastBot:
                 parse_mode=ParseMode.HTML
             )
             
+            completion_text = (
+                f"✅ <b>{duty['admin_name']}</b> completed their duty:\n"
+                f"{duty['duty_info']['emoji']} {duty['duty_info']['name']}\n"
+                + (f"\nNotes: {notes}" if notes else "")
+            )
             for super_admin_id in self.super_admin_ids:
                 if super_admin_id != user_id:
-                    try:
-                        await context.bot.send_message(
-                            chat_id=super_admin_id,
-                            text=(
-                                f"✅ <b>{duty['admin_name']}</b> completed their duty:\n"
-                                f"{duty['duty_info']['emoji']} {duty['duty_info']['name']}\n"
-                                + (f"\nNotes: {notes}" if notes else "")
-                            ),
-                            parse_mode=ParseMode.HTML
-                        )
-                    except:
-                        pass
+                    self._super_admin_digest.setdefault(super_admin_id, []).append(completion_text)
         else:
             await update.message.reply_text("❌ Failed to mark duty as complete. Please try again.")
     
@@ -5861,7 +6562,7 @@ class BroadcastBot:
             await update.message.reply_text("📊 No duty completion data available yet.")
             return
         
-        message = "📊 <b>Duty Completion Stats (Last 7 Days)</b>\n\n"
+        parts = ["📊 <b>Duty Completion Stats (Last 7 Days)</b>\n\n"]
         
         for stat in stats:
             completion_rate = stat['completion_rate']
@@ -5869,34 +6570,26 @@ class BroadcastBot:
             auto = stat.get('auto_completed', 0)
             total = stat['total_duties']
             
-            if completion_rate >= 80: status = "🟢"
-            elif completion_rate >= 50: status = "🟡"
-            else: status = "🔴"
+            status = self._DUTY_RATE_EMOJIS[bisect.bisect_right(self._DUTY_RATE_THRESHOLDS, completion_rate)]
             
-            message += (
+            parts.append(
                 f"{status} <b>{stat['admin_name']}</b>\n"
                 f"   Total: {stat['completed_duties']}/{total} ({completion_rate:.1f}%)\n"
                 f"   Manual: {manual} | Team-covered: {auto}\n\n"
             )
         
-        message += (
+        parts.append(
             "\n<i>💡 'Team-covered' = work done by other admins when this admin was unavailable</i>\n\n"
             "Use /myduty to check your current duty"
         )
+        message = "".join(parts)
         
         await update.message.reply_text(message, parse_mode=ParseMode.HTML)
 
     async def send_duty_reminders_job(self, context: ContextTypes.DEFAULT_TYPE):
         """Send reminders to admins with incomplete duties"""
-        date_key = self.admin_duty_manager.get_date_key()
-    
-        incomplete_duties = self.admin_duty_manager.admin_duties_collection.find({
-            'date': date_key,
-            'completed': False
-        })
-        
-        for duty in incomplete_duties:
-            admin_id = duty['admin_id']
+        reminders = []
+        for duty in self.admin_duty_manager.iter_incomplete_duties():
             duty_info = duty['duty_info']
             
             message = (
@@ -5907,22 +6600,13 @@ class BroadcastBot:
                 f"Please complete it before end of day.\n"
                 f"Mark done: /dutycomplete [notes]"
             )
-            
-            try:
-                await context.bot.send_message(
-                    chat_id=admin_id,
-                    text=message,
-                    parse_mode=ParseMode.HTML
-                )
-            except Exception as e:
-                logger.error(f"Failed to send duty reminder to {admin_id}: {e}")
+            reminders.append(self._notify_admin(duty['admin_id'], message))
+
+        await asyncio.gather(*reminders)
 
     async def channel_post_handler(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        """Auto-save new posts from the educational channel"""
-        if str(update.effective_chat.id) == str(self.edu_content_manager.channel_id):
-            saved = await self.edu_content_manager.process_and_save(update.channel_post)
-            if saved:
-                logger.info(f"Saved new educational content: {update.channel_post.message_id}")
+        """Queue new posts from the educational channel (registered behind a filters.Chat for it)"""
+        self._queue_edu_save(update.channel_post)
 
     async def forward_listener(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Allow admins to forward old posts to backfill the database"""
@@ -5931,9 +6615,51 @@ class BroadcastBot:
             return
 
         if update.message.forward_from_chat:
-             saved = await self.edu_content_manager.process_and_save(update.message)
-             if saved:
-                 await update.message.reply_text("✅ Content saved to educational database!")
+             if self._queue_edu_save(update.message):
+                 await update.message.reply_text("✅ Content queued for the educational database!")
+
+    def _queue_edu_save(self, message) -> bool:
+        """Queue a message for the next educational-content flush; repeats of one post collapse"""
+        entry = self.edu_content_manager.build_entry(message)
+        if not entry:
+            return False
+        self._pending_edu_saves[(entry['chat_id'], entry['message_id'])] = entry
+        return True
+
+    async def flush_edu_saves(self, context: ContextTypes.DEFAULT_TYPE):
+        """Write queued educational content in one bulk upsert; a failed batch is requeued"""
+        if not self._pending_edu_saves:
+            return
+        entries = list(self._pending_edu_saves.values())
+        self._pending_edu_saves = {}
+        saved = await asyncio.to_thread(self.edu_content_manager.save_entries_bulk, entries)
+        if saved:
+            logger.info(f"Saved {saved} educational content item(s)")
+            return
+        for entry in entries:
+            self._pending_edu_saves.setdefault((entry['chat_id'], entry['message_id']), entry)
+
+    def _spawn(self, coro) -> asyncio.Task:
+        """Run a fire-and-forget coroutine, holding a reference until it finishes"""
+        task = asyncio.create_task(coro)
+        self._bg_tasks.add(task)
+        task.add_done_callback(self._bg_task_done)
+        return task
+
+    def _bg_task_done(self, task: asyncio.Task):
+        """Release a finished background task and log its failure"""
+        self._bg_tasks.discard(task)
+        if not task.cancelled() and task.exception():
+            logger.error(f"Background task {task.get_coro().__qualname__} failed: {task.exception()}")
+
+    def _get_push_session(self) -> aiohttp.ClientSession:
+        """Return the shared keep-alive Expo push session, creating it on first use"""
+        if self._push_session is None or self._push_session.closed:
+            self._push_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=PUSH_CONNECTION_LIMIT, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=10)
+            )
+        return self._push_session
 
     async def send_push_to_users(self, user_ids: list, title: str, body: str, data: dict = None):
         """Send Expo Push Notifications with Bulk Writes and Batching"""
@@ -5995,27 +6721,26 @@ class BroadcastBot:
             if not all_expo_messages:
                 return
                 
-            async with aiohttp.ClientSession() as session:
-                EXPO_CHUNK_SIZE = 100
-                total_sent = 0
-                
-                for i in range(0, len(all_expo_messages), EXPO_CHUNK_SIZE):
-                    chunk = all_expo_messages[i:i + EXPO_CHUNK_SIZE]
-                    try:
-                        async with session.post(
-                            'https://exp.host/--/api/v2/push/send',
-                            json=chunk,
-                            headers={
-                                'Accept': 'application/json',
-                                'Accept-Encoding': 'gzip, deflate',
-                                'Content-Type': 'application/json'
-                            },
-                            timeout=aiohttp.ClientTimeout(total=10)
-                        ) as response:
-                            if response.status == 200:
-                                total_sent += len(chunk)
-                    except Exception as e:
-                        logger.error(f"Error sending batch {i}: {e}")
+            session = self._get_push_session()
+            EXPO_CHUNK_SIZE = 100
+            total_sent = 0
+            
+            for i in range(0, len(all_expo_messages), EXPO_CHUNK_SIZE):
+                chunk = all_expo_messages[i:i + EXPO_CHUNK_SIZE]
+                try:
+                    async with session.post(
+                        'https://exp.host/--/api/v2/push/send',
+                        json=chunk,
+                        headers={
+                            'Accept': 'application/json',
+                            'Accept-Encoding': 'gzip, deflate',
+                            'Content-Type': 'application/json'
+                        }
+                    ) as response:
+                        if response.status == 200:
+                            total_sent += len(chunk)
+                except Exception as e:
+                    logger.error(f"Error sending batch {i}: {e}")
 
             logger.info(f"✅ Push batch completed: {total_sent} messages sent")
 
@@ -6564,8 +7289,9 @@ class BroadcastBot:
             """API: Get chat history"""
             try:
                 user_id = int(request.match_info['user_id'])
-                cursor = self.db.db['support_messages'].find({'user_id': user_id}).sort('timestamp', 1)
-                messages = list(cursor)
+                messages = await asyncio.to_thread(
+                    lambda: list(self.db.db['support_messages'].find({'user_id': user_id}).sort('timestamp', 1))
+                )
                 for m in messages: m['_id'] = str(m['_id'])
                 return web.json_response(messages)
             except Exception as e:
@@ -6575,9 +7301,9 @@ class BroadcastBot:
             """API: End chat and delete history"""
             try:
                 user_id = int(request.match_info['user_id'])
-                self.db.db['support_messages'].delete_many({'user_id': user_id})
+                await asyncio.to_thread(self.db.db['support_messages'].delete_many, {'user_id': user_id})
                 
-                support_group = self.db.get_support_group()
+                support_group = await asyncio.to_thread(self.db.get_support_group)
                 if support_group:
                     try:
                         await self.application.bot.send_message(
@@ -6669,7 +7395,7 @@ class BroadcastBot:
                 if not user_id:
                     return web.json_response({'error': 'User ID is required'}, status=400)
 
-                if self.db.is_subscriber(user_id):
+                if await asyncio.to_thread(self.db.is_subscriber, user_id):
                     return web.json_response({
                         'success': False, 
                         'message': 'User is already a VIP subscriber.',
@@ -6689,18 +7415,14 @@ class BroadcastBot:
 
                     if cr_number not in self.cr_numbers:
                         fail_reason.append(f"CR {cr_number} not in partner list")
-                    elif self.db.is_cr_number_used(cr_number):
+                    elif await asyncio.to_thread(self.db.is_cr_number_used, cr_number):
                         fail_reason.append(f"CR {cr_number} already used")
                     
                     detected_balance = 0.0
                     try:
-                        import pytesseract
-                        from PIL import Image
-                        import io
-                        import re
-
-                        text = pytesseract.image_to_string(Image.open(io.BytesIO(image_data)))
-                        matches = re.findall(r'\$?(\d[\d,]*\.\d{2})', text)
+                        async with self._ocr_semaphore:
+                            text = await asyncio.to_thread(ImageTextExtractor.extract_raw_text, image_data)
+                        matches = BALANCE_RE.findall(text)
                         
                         if matches:
                             detected_balance = float(matches[0].replace(',', ''))
@@ -6717,12 +7439,12 @@ class BroadcastBot:
                         auto_verify_passed = True
 
                     if auto_verify_passed:
-                        self.db.mark_cr_number_as_used(cr_number, user_id)
-                        self.db.add_subscriber(user_id)
-                        self.engagement_tracker.update_engagement(user_id, 'vip_subscribed')
+                        await asyncio.to_thread(self.db.mark_cr_number_as_used, cr_number, user_id)
+                        await asyncio.to_thread(self.db.add_subscriber, user_id)
+                        await asyncio.to_thread(self.engagement_tracker.update_engagement, user_id, 'vip_subscribed')
                         
-                        self.db.create_vip_request(user_id, 'deriv', {'cr_number': cr_number})
-                        self.db.update_vip_request_status(user_id, 'approved', 0, reason="Auto-verified")
+                        await asyncio.to_thread(self.db.create_vip_request, user_id, 'deriv', {'cr_number': cr_number})
+                        await asyncio.to_thread(self.db.update_vip_request_status, user_id, 'approved', 0, reason="Auto-verified")
 
                         try:
                             await self.application.bot.send_message(
@@ -6736,7 +7458,7 @@ class BroadcastBot:
                     
                     else:
                         details = {'cr_number': cr_number}
-                        self.db.create_vip_request(user_id, 'deriv', details)
+                        await asyncio.to_thread(self.db.create_vip_request, user_id, 'deriv', details)
                         
                         reason_str = ", ".join(fail_reason)
                         user_info = (
@@ -6792,7 +7514,7 @@ class BroadcastBot:
                         'account_number': acc_num,
                         'telegram_id': tg_handle
                     }
-                    self.db.create_vip_request(user_id, 'currencies', details)
+                    await asyncio.to_thread(self.db.create_vip_request, user_id, 'currencies', details)
 
                     user_info = (
                         f"📱 <b>New App VIP Request (Currencies)</b>\n\n"
@@ -7199,6 +7921,7 @@ class BroadcastBot:
                 if result.matched_count == 0:
                     return web.json_response({'error': 'User not found'}, status=404)
 
+                self.notification_manager.invalidate_opt_outs()
                 return web.json_response({'success': True})
 
             except Exception as e:
@@ -7361,7 +8084,7 @@ class BroadcastBot:
                         
                         if author_id and author_id != user_id:
                             logger.info(f"Sending reaction notification to author {author_id} from {liker_name}")
-                            asyncio.create_task(self.send_push_to_users(
+                            self._spawn(self.send_push_to_users(
                                 [author_id],
                                 "New Reaction ❤️",
                                 f"Your post was liked by {liker_name}",
@@ -7422,30 +8145,67 @@ class BroadcastBot:
 
         return app
 
-    def run_health_server(self, port: int):
-        """Run API server in thread"""
-        async def start_server():
-            app = self.create_api_server()
-            runner = web.AppRunner(app)
-            await runner.setup()
-            site = web.TCPSite(runner, '0.0.0.0', port)
-            await site.start()
-            logger.info(f"API Server running on port {port}")
-
-            while True:
-                await asyncio.sleep(3600)
-
-        def run_in_thread():
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            loop.run_until_complete(start_server())
+    async def start_api_server(self, application: Application):
+        """Serve the API on the bot's own event loop (post_init hook)"""
+        self._api_runner = web.AppRunner(self.create_api_server())
+        await self._api_runner.setup()
+        await web.TCPSite(self._api_runner, '0.0.0.0', self.api_port).start()
+        logger.info(f"API Server running on port {self.api_port}")
 
-        thread = threading.Thread(target=run_in_thread, daemon=True)
-        thread.start()
+    async def flush_super_admin_digest(self, context: ContextTypes.DEFAULT_TYPE):
+        """Send each super admin one message with the duty completions queued since the last run"""
+        if not self._super_admin_digest:
+            return
+        digest, self._super_admin_digest = self._super_admin_digest, {}
+        await asyncio.gather(*(
+            self._notify_admin(super_admin_id, "\n\n".join(lines))
+            for super_admin_id, lines in digest.items()
+        ))
 
-    def create_application(self):
+    async def flush_engagement_job(self, context: ContextTypes.DEFAULT_TYPE):
+        """Write buffered engagement counters"""
+        await asyncio.to_thread(self.engagement_tracker.flush_engagement)
+
+    async def send_pending_notices(self, application: Application):
+        """Send the queued super-admin digest while the bot can still reach Telegram (post_stop hook)"""
+        await self.flush_super_admin_digest(None)
+
+    async def stop_services(self, application: Application):
+        """Stop the API server, settle background tasks, flush buffered writes and close the push session (post_shutdown hook)"""
+        if self._api_runner:
+            await self._api_runner.cleanup()
+        if self._bg_tasks:
+            done, pending = await asyncio.wait(set(self._bg_tasks), timeout=BG_TASK_SHUTDOWN_TIMEOUT)
+            if pending:
+                logger.warning(f"Cancelling {len(pending)} background task(s) still running at shutdown")
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+        self.engagement_tracker.flush_engagement()
+        await self.flush_edu_saves(None)
+        if self._push_session and not self._push_session.closed:
+            await self._push_session.close()
+
+    def create_application(self, api_port: int = 8000):
         """Create and configure application with all handlers and jobs."""
-        application = Application.builder().token(self.token).build()
+        self.api_port = api_port
+        application = (
+            Application.builder()
+            .token(self.token)
+            .request(HTTPXRequest(
+                connection_pool_size=REQUEST_POOL_SIZE,
+                read_timeout=20,
+                write_timeout=20,
+                pool_timeout=10
+            ))
+            .get_updates_request(HTTPXRequest(read_timeout=30))
+            .rate_limiter(TelegramRateLimiter())
+            .concurrent_updates(PerChatUpdateProcessor(UPDATE_CONCURRENCY))
+            .post_init(self.start_api_server)
+            .post_stop(self.send_pending_notices)
+            .post_shutdown(self.stop_services)
+            .build()
+        )
 
         
         broadcast_handler = ConversationHandler(
@@ -7455,11 +8215,11 @@ class BroadcastBot:
             ],
             states={
                 WAITING_INITIAL_PLATFORM: [CallbackQueryHandler(self.handle_initial_platform_choice, pattern="^platform_")],
-                WAITING_MESSAGE: [MessageHandler(filters.ALL & ~filters.COMMAND, self.receive_broadcast_message)],
+                WAITING_MESSAGE: [MessageHandler(ALL_NO_COMMAND, self.receive_broadcast_message)],
                 WAITING_BUTTONS: [
                     CallbackQueryHandler(self.handle_watermark_choice, pattern="^watermark_"),
                     CallbackQueryHandler(self.handle_buttons_choice, pattern="^(add_buttons|skip_buttons)$"),
-                    MessageHandler(filters.TEXT & ~filters.COMMAND, self.receive_buttons)
+                    MessageHandler(TEXT_NO_COMMAND, self.receive_buttons)
                 ],
                 WAITING_PROTECTION: [CallbackQueryHandler(self.handle_protection_choice, pattern="^protect_")],
                 WAITING_TARGET: [CallbackQueryHandler(self.handle_target_choice, pattern="^target_")]
@@ -7470,14 +8230,14 @@ class BroadcastBot:
         schedule_handler = ConversationHandler(
             entry_points=[CommandHandler("schedule", self.schedule_broadcast_start)],
             states={
-                WAITING_MESSAGE: [MessageHandler(filters.ALL & ~filters.COMMAND, self.receive_broadcast_message)],
+                WAITING_MESSAGE: [MessageHandler(ALL_NO_COMMAND, self.receive_broadcast_message)],
                 WAITING_BUTTONS: [
                     CallbackQueryHandler(self.handle_watermark_choice, pattern="^watermark_"),
                     CallbackQueryHandler(self.handle_buttons_choice, pattern="^(add_buttons|skip_buttons)$"),
-                    MessageHandler(filters.TEXT & ~filters.COMMAND, self.receive_buttons)
+                    MessageHandler(TEXT_NO_COMMAND, self.receive_buttons)
                 ],
                 WAITING_PROTECTION: [CallbackQueryHandler(self.handle_protection_choice, pattern="^protect_")],
-                WAITING_SCHEDULE_TIME: [MessageHandler(filters.TEXT & ~filters.COMMAND, self.receive_schedule_time)],
+                WAITING_SCHEDULE_TIME: [MessageHandler(TEXT_NO_COMMAND, self.receive_schedule_time)],
                 WAITING_SCHEDULE_REPEAT: [CallbackQueryHandler(self.receive_schedule_repeat, pattern="^repeat_")],
                 WAITING_TARGET: [CallbackQueryHandler(self.handle_target_choice, pattern="^target_")]
             },
@@ -7487,9 +8247,9 @@ class BroadcastBot:
         template_handler = ConversationHandler(
             entry_points=[CommandHandler("savetemplate", self.save_template_start)],
             states={
-                WAITING_TEMPLATE_MESSAGE: [MessageHandler(filters.ALL & ~filters.COMMAND, self.receive_template_message)],
-                WAITING_TEMPLATE_NAME: [MessageHandler(filters.TEXT & ~filters.COMMAND, self.receive_template_name)],
-                WAITING_TEMPLATE_CATEGORY: [MessageHandler(filters.TEXT & ~filters.COMMAND, self.receive_template_category)]
+                WAITING_TEMPLATE_MESSAGE: [MessageHandler(ALL_NO_COMMAND, self.receive_template_message)],
+                WAITING_TEMPLATE_NAME: [MessageHandler(TEXT_NO_COMMAND, self.receive_template_name)],
+                WAITING_TEMPLATE_CATEGORY: [MessageHandler(TEXT_NO_COMMAND, self.receive_template_category)]
             },
             fallbacks=[CommandHandler("cancel", self.cancel_broadcast)]
         )
@@ -7497,7 +8257,7 @@ class BroadcastBot:
         add_admin_handler = ConversationHandler(
             entry_points=[CommandHandler("addadmin", self.add_admin_start)],
             states={
-                WAITING_ADMIN_ID: [MessageHandler(filters.TEXT & ~filters.COMMAND, self.receive_admin_id)],
+                WAITING_ADMIN_ID: [MessageHandler(TEXT_NO_COMMAND, self.receive_admin_id)],
                 WAITING_ADMIN_ROLE: [CallbackQueryHandler(self.receive_admin_role, pattern="^role_")]
             },
             fallbacks=[CommandHandler("cancel", self.cancel_broadcast)]
@@ -7508,7 +8268,7 @@ class BroadcastBot:
             states={
                 WAITING_SIGNAL_MESSAGE: [
                     CallbackQueryHandler(self.show_signal_example, pattern="^show_signal_example$"),
-                    MessageHandler(filters.ALL & ~filters.COMMAND, self.receive_signal_suggestion)
+                    MessageHandler(ALL_NO_COMMAND, self.receive_signal_suggestion)
                 ]
             },
             fallbacks=[CommandHandler("cancel", self.cancel_broadcast)]
@@ -7518,15 +8278,15 @@ class BroadcastBot:
             entry_points=[CommandHandler("subscribe", self.subscribe_start)],
             states={
                 WAITING_VIP_GROUP: [CallbackQueryHandler(self.receive_vip_group)],
-                WAITING_ACCOUNT_CREATION_CONFIRMATION: [MessageHandler(filters.TEXT & ~filters.COMMAND, self.receive_account_creation_confirmation)],
-                WAITING_ACCOUNT_DATE: [MessageHandler(filters.TEXT & ~filters.COMMAND, self.receive_account_date)],
-                WAITING_CR_NUMBER: [MessageHandler(filters.TEXT & ~filters.COMMAND, self.receive_cr_number)],
+                WAITING_ACCOUNT_CREATION_CONFIRMATION: [MessageHandler(TEXT_NO_COMMAND, self.receive_account_creation_confirmation)],
+                WAITING_ACCOUNT_DATE: [MessageHandler(TEXT_NO_COMMAND, self.receive_account_date)],
+                WAITING_CR_NUMBER: [MessageHandler(TEXT_NO_COMMAND, self.receive_cr_number)],
                 WAITING_SCREENSHOT: [MessageHandler(filters.PHOTO, self.receive_screenshot)],
-                WAITING_KENNEDYNESPOT_CONFIRMATION: [MessageHandler(filters.TEXT & ~filters.COMMAND, self.receive_kennedynespot_confirmation)],
+                WAITING_KENNEDYNESPOT_CONFIRMATION: [MessageHandler(TEXT_NO_COMMAND, self.receive_kennedynespot_confirmation)],
                 WAITING_BROKER_CHOICE: [CallbackQueryHandler(self.receive_broker_choice, pattern="^broker_")],
-                WAITING_ACCOUNT_NAME: [MessageHandler(filters.TEXT & ~filters.COMMAND, self.receive_account_name)],
-                WAITING_ACCOUNT_NUMBER: [MessageHandler(filters.TEXT & ~filters.COMMAND, self.receive_account_number)],
-                WAITING_TELEGRAM_ID: [MessageHandler(filters.TEXT & ~filters.COMMAND, self.receive_telegram_id)],
+                WAITING_ACCOUNT_NAME: [MessageHandler(TEXT_NO_COMMAND, self.receive_account_name)],
+                WAITING_ACCOUNT_NUMBER: [MessageHandler(TEXT_NO_COMMAND, self.receive_account_number)],
+                WAITING_TELEGRAM_ID: [MessageHandler(TEXT_NO_COMMAND, self.receive_telegram_id)],
             },
             fallbacks=[CommandHandler("cancel", self.cancel_broadcast)],
         )
@@ -7583,7 +8343,7 @@ class BroadcastBot:
 
         application.add_handler(
             MessageHandler(
-                filters.ChatType.PRIVATE & filters.Regex(r"^(Hello|Hi|Hey|Good morning|Good afternoon|Good evening|What's up|Howdy|Greetings|Hey there)$"),
+                filters.ChatType.PRIVATE & GreetingFilter(),
                 self.handle_greeting,
             )
         )
@@ -7623,15 +8383,14 @@ class BroadcastBot:
         )
 
         if self.edu_content_manager:
-            try:
-                channel_id_int = int(self.edu_content_manager.channel_id)
+            if self._edu_channel_id_int is not None:
                 application.add_handler(
                     MessageHandler(
-                        filters.Chat(chat_id=channel_id_int) & filters.UpdateType.CHANNEL_POST,
+                        filters.Chat(chat_id=self._edu_channel_id_int) & filters.UpdateType.CHANNEL_POST,
                         self.channel_post_handler
                     )
                 )
-            except ValueError:
+            else:
                 logger.error("EDUCATION_CHANNEL_ID must be an integer for the listener to work.")
 
             application.add_handler(
@@ -7649,54 +8408,78 @@ class BroadcastBot:
             first=10
         )
 
-        utc_midnight = dt_time(hour=0, minute=0, tzinfo=timezone.utc)
+        application.job_queue.run_repeating(
+            self.process_achievement_checks,
+            interval=5,
+            first=5
+        )
+
+        application.job_queue.run_repeating(
+            self.flush_engagement_job,
+            interval=2,
+            first=2
+        )
+
+        application.job_queue.run_repeating(
+            self.flush_super_admin_digest,
+            interval=5,
+            first=5
+        )
+
+        if self.force_sub_channel:
+            application.job_queue.run_repeating(
+                self.prune_sub_cache,
+                interval=SUB_CACHE_TTL,
+                first=SUB_CACHE_TTL
+            )
+
+        if self.edu_content_manager:
+            application.job_queue.run_repeating(
+                self.flush_edu_saves,
+                interval=2,
+                first=2
+            )
+
         application.job_queue.run_daily(
             self.run_leaderboards_job_v2,
-            time=utc_midnight,
+            time=UTC_MIDNIGHT,
             days=(1,) 
         )
         
-        utc_10am = dt_time(hour=10, minute=0, tzinfo=timezone.utc)
         application.job_queue.run_daily(
             self.send_daily_tip,
-            time=utc_10am
+            time=UTC_10AM
         )
         
-        utc_12pm = dt_time(hour=12, minute=0, tzinfo=timezone.utc)
         application.job_queue.run_daily(
             self.re_engage_users_job,
-            time=utc_12pm
+            time=UTC_NOON
         )
 
         if self.edu_content_manager:
-            utc_2am = dt_time(hour=2, minute=0, tzinfo=timezone.utc)
             application.job_queue.run_daily(
                 self.auto_sync_education_job,
-                time=utc_2am
+                time=UTC_2AM
             )
 
-        utc_midnight = dt_time(hour=0, minute=0, tzinfo=timezone.utc)
         application.job_queue.run_daily(
             self.assign_daily_duties_job,
-            time=utc_midnight
+            time=UTC_MIDNIGHT
         )
 
-        utc_6pm = dt_time(hour=18, minute=0, tzinfo=timezone.utc)
         application.job_queue.run_daily(
             self.send_duty_reminders_job,
-            time=utc_6pm
+            time=UTC_6PM
         )
-        utc_6pm = dt_time(hour=18, minute=0, tzinfo=timezone.utc)
         application.job_queue.run_daily(
             self.post_weekly_performance_to_twitter,
-            time=utc_6pm,
+            time=UTC_6PM,
             days=(0,) 
         )
 
-        utc_end_day = dt_time(hour=23, minute=55, tzinfo=timezone.utc)
         application.job_queue.run_daily(
             self.end_of_day_duty_verification_job,
-            time=utc_end_day
+            time=UTC_END_OF_DAY
         )
 
         return application
@@ -7710,7 +8493,7 @@ class BroadcastBot:
         await PerformanceTransparency.show_verified_performance(update, context, self.db)
 
     async def show_referral_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        bot_username = (await context.bot.get_me()).username
+        bot_username = context.bot.username
         await self.referral_system.show_referral_stats(update.effective_user.id, bot_username, self.db, update)
 
     async def my_progress_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -7742,31 +8525,7 @@ class BroadcastBot:
 
     async def suggest_broadcast_time(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Help admins choose optimal broadcast time"""
-        
-        pipeline = [
-            {
-                '$match': {'last_activity': {'$exists': True, '$ne': None}}
-            },
-            {
-                '$project': {
-                    'hour': {
-                        '$hour': {
-                            '$toDate': {'$multiply': ['$last_activity', 1000]}
-                        }
-                    }
-                }
-            },
-            {
-                '$group': {
-                    '_id': '$hour',
-                    'count': {'$sum': 1}
-                }
-            },
-            {'$sort': {'count': -1}},
-            {'$limit': 3}
-        ]
-        
-        peak_hours = list(self.db.users_collection.aggregate(pipeline))
+        peak_hours = await asyncio.to_thread(self.db.get_peak_activity_hours)
         
         if peak_hours:
             message = (
@@ -7887,8 +8646,9 @@ class BroadcastBot:
         photo_bytes = await photo_file.download_as_bytearray()
 
         try:
-            text = pytesseract.image_to_string(Image.open(io.BytesIO(photo_bytes)))
-            matches = re.findall(r'\$?(\d[\d,]*\.\d{2})', text)
+            async with self._ocr_semaphore:
+                text = await asyncio.to_thread(ImageTextExtractor.extract_raw_text, bytes(photo_bytes))
+            matches = BALANCE_RE.findall(text)
             
             if matches:
                 balance_str = matches[0].replace(',', '')
@@ -7987,7 +8747,7 @@ class BroadcastBot:
         await query.answer()
 
         user_id = query.from_user.id
-        if user_id not in self.super_admin_ids and not self.db.get_admin_role(user_id):
+        if user_id not in self.super_admin_ids and not self.get_admin_role(user_id):
             await query.answer("❌ You are not authorized.", show_alert=True)
             return
 
@@ -8002,7 +8762,7 @@ class BroadcastBot:
             self.admin_duty_manager.credit_duty_for_action(user_id, 'vip_approved')
             self.engagement_tracker.update_engagement(target_user_id, 'vip_subscribed')
             
-            asyncio.create_task(self.send_push_to_users(
+            self._spawn(self.send_push_to_users(
                 [target_user_id], "VIP Approved! 🎉", "Restart app to access.",
                 data={'screen': 'Signals'}
             ))
@@ -8047,7 +8807,7 @@ class BroadcastBot:
         self.db.log_activity(admin_id, 'vip_declined', {'user_id': user_id_to_decline, 'reason': reason})
 
         try:
-            asyncio.create_task(self.send_push_to_users(
+            self._spawn(self.send_push_to_users(
                 [user_id_to_decline],
                 "VIP Request Update",
                 f"Your VIP request was declined. Reason: {reason}",
@@ -8094,16 +8854,16 @@ class BroadcastBot:
             time_str = update.message.text.lower()
             delta = timedelta()
             
-            parts = re.findall(r'(\d+)\s*(d|h|m)', time_str)
+            parts = SCHEDULE_OFFSET_RE.findall(time_str)
             
             if parts:
                 for val_str, unit in parts:
                     val = int(val_str)
-                    if 'd' in unit:
+                    if unit == 'd':
                         delta += timedelta(days=val)
-                    elif 'h' in unit:
+                    elif unit == 'h':
                         delta += timedelta(hours=val)
-                    elif 'm' in unit:
+                    else:
                         delta += timedelta(minutes=val)
                 scheduled_time = datetime.now() + delta
             else:
@@ -8310,6 +9070,7 @@ class BroadcastBot:
             user_id = context.user_data['new_admin_id']
 
             if self.db.add_admin(user_id, role, query.from_user.id):
+                self._refresh_admin_cache()
                 await query.edit_message_text(f"✅ User {user_id} is now an admin with role '{role.value}'.")
             else:
                 await query.edit_message_text(f"❌ Failed to add admin.")
@@ -8332,6 +9093,7 @@ class BroadcastBot:
         try:
             user_id = int(context.args[0])
             if self.db.remove_admin(user_id, update.effective_user.id):
+                self._refresh_admin_cache()
                 await update.message.reply_text(f"✅ Admin {user_id} has been removed.")
             else:
                 await update.message.reply_text(f"❌ Admin {user_id} not found.")
@@ -8365,7 +9127,7 @@ class BroadcastBot:
             return
 
         log_list = "\n".join([
-            f"• {datetime.fromtimestamp(log['timestamp']).strftime('%Y-%m-%d %H:%M')} "
+            f"• {format_minute(int(log['timestamp']) // 60)} "
             f"| {log['user_id']} | {log['action']} | {log.get('details', {})}"
             for log in logs
         ])
@@ -8470,7 +9232,7 @@ class BroadcastBot:
 
         broadcast_list = "\n".join([
             f"• ID: {str(b['_id'])} | "
-            f"{datetime.fromtimestamp(b['scheduled_time']).strftime('%Y-%m-%d %H:%M')}"
+            f"{format_minute(int(b['scheduled_time']) // 60)}"
             for b in broadcasts
         ])
         await update.message.reply_text(f"⏰ Scheduled Broadcasts:\n{broadcast_list}\n\n"
@@ -8585,10 +9347,11 @@ class BroadcastBot:
     async def pips_calculator_v2(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Enhanced with context and education"""
         
-        self.engagement_tracker.update_engagement(update.effective_user.id, 'command_used')
+        user_id = update.effective_user.id
+        self.engagement_tracker.queue_engagement(user_id, 'command_used')
         
-        if not await self.is_user_subscribed(update.effective_user.id, context):
-            await self.send_join_channel_message(update.effective_user.id, context)
+        if not await self.is_user_subscribed(user_id, context):
+            await self.send_join_channel_message(user_id, context)
             return
         
         if len(context.args) != 3:
@@ -8685,10 +9448,11 @@ class BroadcastBot:
         Professional Position Size Calculator
         Usage: /positionsize [PAIR] [RISK_USD] [SL_PIPS]
         """
-        self.engagement_tracker.update_engagement(update.effective_user.id, 'command_used')
+        user_id = update.effective_user.id
+        self.engagement_tracker.queue_engagement(user_id, 'command_used')
 
-        if not await self.is_user_subscribed(update.effective_user.id, context):
-            await self.send_join_channel_message(update.effective_user.id, context)
+        if not await self.is_user_subscribed(user_id, context):
+            await self.send_join_channel_message(user_id, context)
             return
 
         if len(context.args) != 3:
@@ -8745,11 +9509,8 @@ class BroadcastBot:
         if not self.edu_content_manager:
             logger.warning("Educational content manager not initialized. Skipping daily tip.")
             return
-        all_users = self.db.get_all_users()
-        target_users = {
-            user_id for user_id in all_users 
-            if self.notification_manager.should_notify(user_id, 'tips')
-        }
+        all_users = await asyncio.to_thread(self.db.get_all_users)
+        target_users = await asyncio.to_thread(self.notification_manager.get_eligible_users, all_users, 'tips')
         
         if not target_users:
             logger.info("No users to send educational content to")
@@ -8799,7 +9560,7 @@ class BroadcastBot:
     async def settings_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Let users control their experience"""
         
-        self.engagement_tracker.update_engagement(update.effective_user.id, 'command_used')
+        self.engagement_tracker.queue_engagement(update.effective_user.id, 'command_used')
         user_id = update.effective_user.id
         prefs = self.notification_manager.get_notification_preferences(user_id)
         
@@ -8869,6 +9630,7 @@ class BroadcastBot:
                         {'user_id': user_id},
                         {'$set': {f'notifications.{actual_key}': new_status}}
                     )
+                    self.notification_manager.invalidate_opt_outs()
                 else:
                     logger.warning(f"Unknown settings toggle key: {key}")
 
@@ -8936,13 +9698,13 @@ def main():
     logger.info("Connecting to MongoDB...")
     mongo_handler = MongoDBHandler(MONGODB_URI)
 
+    port = int(os.getenv('PORT', 8000))
+
     bot = BroadcastBot(BOT_TOKEN, admin_ids, mongo_handler)
-    application = bot.create_application()
+    application = bot.create_application(api_port=port)
 
     bot.application = application
 
-    port = int(os.getenv('PORT', 8000))
-
     logger.info(f"Starting bot with {len(admin_ids)} super admin(s)")
     logger.info(f"Health server on port {port}")
 
@@ -8951,10 +9713,6 @@ def main():
     else:
         logger.info("Force-sub feature is DISABLED (FORCE_SUB_CHANNEL not set)")
 
-    bot.run_health_server(port)
-
-    time.sleep(2)
-
     logger.info("Starting Telegram bot...")
     try:
         application.run_polling()